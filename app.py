@@ -3,7 +3,6 @@ Streamlit Web Application for Homeless Household to Temporary Accommodation Matc
 Run with: streamlit run app.py
 """
 import streamlit as st
-import pandas as pd
 from pathlib import Path
 import sys
 
@@ -11,6 +10,8 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from matching_engine import AccommodationMatcher
+from match_cache import MatchCache
+import columnar_data
 
 # Page configuration
 st.set_page_config(
@@ -29,25 +30,46 @@ based on UK housing allocation policies and individual household needs.
 # Load property data
 @st.cache_data
 def load_properties():
-    """Load property data from CSV."""
+    """Load property data, from the columnar copy when there is one."""
     property_file = Path('data/property_data.csv')
-    if not property_file.exists():
+    if not columnar_data.data_available(property_file):
         st.error("Property data not found. Please run: python src/generate_data.py")
         return None
-    # Read CSV and ensure string columns are strings
-    df = pd.read_csv(property_file, dtype={
-        'property_id': str,
-        'location': str,
-        'neighbour_quality': str,
-        'tenure_length': str,
-        'access_features': str,
-        'nearby_amenities': str
-    })
-    return df
+    return columnar_data.load_properties(property_file)
+
+@st.cache_resource
+def get_matcher(properties_df):
+    """Matcher over the loaded properties, built once per data load."""
+    return AccommodationMatcher(properties_df)
+
+@st.cache_resource
+def get_match_cache():
+    """Ranked results shared across reruns, so resubmitting a form is instant."""
+    return MatchCache(maxsize=128, ttl=900)
 
 properties_df = load_properties()
 
 if properties_df is not None:
+    # What-if weights; the ranking below is recombined as soon as they change
+    with st.sidebar:
+        st.header("⚖️ Scoring Weights")
+        raw_weights = {
+            component: st.slider(label, 0, 100, int(round(AccommodationMatcher.WEIGHTS[component] * 100)), 5)
+            for component, label in [
+                ('location', "🎯 Location"),
+                ('bedroom_suitability', "🛏️ Bedroom suitability"),
+                ('affordability', "💷 Affordability"),
+                ('access_needs', "♿ Access needs"),
+                ('amenities', "🏫 Amenities")
+            ]
+        }
+        total = sum(raw_weights.values())
+        if total == 0:
+            st.warning("All weights are zero; using the default weights.")
+            weights = dict(AccommodationMatcher.WEIGHTS)
+        else:
+            weights = {component: value / total for component, value in raw_weights.items()}
+    
     # Create form
     st.header("📋 Household Information Form")
     st.markdown("Please provide details about the household seeking accommodation.")
@@ -145,6 +167,8 @@ if properties_df is not None:
         # Validate required fields
         if not household_composition or not area_restrictions:
             st.error("Please fill in all required fields marked with *")
+            # Don't keep showing the previous household's results
+            st.session_state.pop('household', None)
         else:
             # Create household dict
             household = {
@@ -163,86 +187,90 @@ if properties_df is not None:
                 'drug_use': drug_use
             }
             
-            # Run matching
-            with st.spinner("Matching household to suitable properties..."):
-                matcher = AccommodationMatcher(properties_df)
-                results = matcher.match_household(household)
-            
-            # Display results
-            st.header("🎯 Matching Results")
-            
-            # Check for urgent flags
-            if length_of_placement >= 42:
-                st.error("🚨 URGENT: This household has reached or exceeded the 42-day emergency accommodation limit. Immediate placement required.")
-            elif length_of_placement >= 35:
-                st.warning("⚠️ WARNING: This household is approaching the 42-day emergency accommodation limit.")
-            
-            # Display top 3 recommendations
-            st.subheader("Top 3 Recommended Properties")
-            
-            top_3 = results[:3]
-            
-            if not top_3:
-                st.warning("No properties found matching the criteria.")
-            else:
-                for idx, prop in enumerate(top_3, 1):
-                    with st.expander(f"#{idx} - {prop['property_id']} ({prop['location']}) - Score: {prop['overall_score']:.2f}", expanded=(idx==1)):
-                        # Property details
-                        col1, col2, col3 = st.columns(3)
-                        
-                        with col1:
-                            st.markdown("**Property Details**")
-                            st.write(f"📍 Location: {prop['location']}")
-                            st.write(f"🛏️ Bedrooms: {prop['beds']}")
-                            st.write(f"🚪 Rooms: {prop['rooms']}")
-                            st.write(f"💷 Rent: £{prop['affordability']}/month")
-                            st.write(f"📅 Tenure: {prop['tenure_length']}")
-                        
-                        with col2:
-                            st.markdown("**Features & Amenities**")
-                            st.write(f"♿ Access: {prop['access_features']}")
-                            st.write(f"🏘️ Neighbourhood: {prop['neighbour_quality']}")
-                            st.write(f"🏫 Nearby: {prop['nearby_amenities']}")
-                        
-                        with col3:
-                            st.markdown("**Suitability Scores**")
-                            scores = prop['component_scores']
-                            st.write(f"📍 Location: {scores['location']:.2f}")
-                            st.write(f"🛏️ Bedrooms: {scores['bedrooms']:.2f}")
-                            st.write(f"💷 Affordability: {scores['affordability']:.2f}")
-                            st.write(f"♿ Access: {scores['access']:.2f}")
-                            st.write(f"🏫 Amenities: {scores['amenities']:.2f}")
-                        
-                        # Match explanation
-                        st.markdown("**Match Explanation**")
-                        st.info(prop['match_explanation'])
-                        
-                        # Suitability flags
-                        if prop['suitability_flags']:
-                            st.markdown("**Suitability Flags**")
-                            for flag in prop['suitability_flags']:
-                                if '🚨' in flag:
-                                    st.error(flag)
-                                else:
-                                    st.warning(flag)
-                        else:
-                            st.success("✅ No suitability issues identified")
-            
-            # Show all results in table
-            st.subheader("All Properties Ranked")
-            
-            results_table = []
-            for prop in results:
-                results_table.append({
-                    'Property ID': prop['property_id'],
-                    'Location': prop['location'],
-                    'Beds': prop['beds'],
-                    'Rent (£)': prop['affordability'],
-                    'Overall Score': f"{prop['overall_score']:.2f}",
-                    'Issues': len(prop['suitability_flags'])
-                })
-            
-            st.dataframe(results_table, use_container_width=True)
+            st.session_state['household'] = household
+    
+    # Results stay on screen while the scoring weights are adjusted
+    household = st.session_state.get('household')
+    if household is not None:
+        # Run matching
+        with st.spinner("Matching household to suitable properties..."):
+            results = get_match_cache().match(get_matcher(properties_df), household, weights=weights)
+        
+        # Display results
+        st.header("🎯 Matching Results")
+        
+        # Check for urgent flags
+        if household['length_of_placement'] >= 42:
+            st.error("🚨 URGENT: This household has reached or exceeded the 42-day emergency accommodation limit. Immediate placement required.")
+        elif household['length_of_placement'] >= 35:
+            st.warning("⚠️ WARNING: This household is approaching the 42-day emergency accommodation limit.")
+        
+        # Display top 3 recommendations
+        st.subheader("Top 3 Recommended Properties")
+        
+        top_3 = results[:3]
+        
+        if not top_3:
+            st.warning("No properties found matching the criteria.")
+        else:
+            for idx, prop in enumerate(top_3, 1):
+                with st.expander(f"#{idx} - {prop['property_id']} ({prop['location']}) - Score: {prop['overall_score']:.2f}", expanded=(idx==1)):
+                    # Property details
+                    col1, col2, col3 = st.columns(3)
+                    
+                    with col1:
+                        st.markdown("**Property Details**")
+                        st.write(f"📍 Location: {prop['location']}")
+                        st.write(f"🛏️ Bedrooms: {prop['beds']}")
+                        st.write(f"🚪 Rooms: {prop['rooms']}")
+                        st.write(f"💷 Rent: £{prop['affordability']}/month")
+                        st.write(f"📅 Tenure: {prop['tenure_length']}")
+                    
+                    with col2:
+                        st.markdown("**Features & Amenities**")
+                        st.write(f"♿ Access: {prop['access_features']}")
+                        st.write(f"🏘️ Neighbourhood: {prop['neighbour_quality']}")
+                        st.write(f"🏫 Nearby: {prop['nearby_amenities']}")
+                    
+                    with col3:
+                        st.markdown("**Suitability Scores**")
+                        scores = prop['component_scores']
+                        st.write(f"📍 Location: {scores['location']:.2f}")
+                        st.write(f"🛏️ Bedrooms: {scores['bedrooms']:.2f}")
+                        st.write(f"💷 Affordability: {scores['affordability']:.2f}")
+                        st.write(f"♿ Access: {scores['access']:.2f}")
+                        st.write(f"🏫 Amenities: {scores['amenities']:.2f}")
+                    
+                    # Match explanation
+                    st.markdown("**Match Explanation**")
+                    st.info(prop['match_explanation'])
+                    
+                    # Suitability flags
+                    if prop['suitability_flags']:
+                        st.markdown("**Suitability Flags**")
+                        for flag in prop['suitability_flags']:
+                            if '🚨' in flag:
+                                st.error(flag)
+                            else:
+                                st.warning(flag)
+                    else:
+                        st.success("✅ No suitability issues identified")
+        
+        # Show all results in table
+        st.subheader("All Properties Ranked")
+        
+        results_table = []
+        for prop in results:
+            results_table.append({
+                'Property ID': prop['property_id'],
+                'Location': prop['location'],
+                'Beds': prop['beds'],
+                'Rent (£)': prop['affordability'],
+                'Overall Score': f"{prop['overall_score']:.2f}",
+                'Issues': len(prop['suitability_flags'])
+            })
+        
+        st.dataframe(results_table, use_container_width=True)
 
 # Sidebar with information
 with st.sidebar:
@@ -268,4 +296,6 @@ with st.sidebar:
     if properties_df is not None:
         st.metric("Total Properties", len(properties_df))
         st.metric("Locations", properties_df['location'].nunique())
-        st.metric("Avg Rent", f"£{properties_df['affordability'].astype(float).mean():.0f}")
+        st.metric("Avg Rent", f"£{properties_df['affordability'].mean():.0f}")
+        cache_stats = get_match_cache().stats()
+        st.caption(f"Result cache: {cache_stats.hits} hits, {cache_stats.misses} misses")
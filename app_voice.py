@@ -4,7 +4,6 @@ Uses Amazon Transcribe for speech-to-text conversion.
 Run with: streamlit run app_voice.py
 """
 import streamlit as st
-import pandas as pd
 from pathlib import Path
 import sys
 import tempfile
@@ -14,6 +13,8 @@ import os
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from matching_engine import AccommodationMatcher
+from match_cache import MatchCache
+import columnar_data
 from voice_handler import VoiceInputHandler
 
 # Try to import audio recorder
@@ -85,21 +86,22 @@ This service uses voice input technology to make the process more accessible.
 # Load property data
 @st.cache_data
 def load_properties():
-    """Load property data from CSV."""
+    """Load property data, from the columnar copy when there is one."""
     property_file = Path('data/property_data.csv')
-    if not property_file.exists():
+    if not columnar_data.data_available(property_file):
         st.error("Property data not found. Please run: python src/generate_data.py")
         return None
-    # Read CSV and ensure string columns are strings
-    df = pd.read_csv(property_file, dtype={
-        'property_id': str,
-        'location': str,
-        'neighbour_quality': str,
-        'tenure_length': str,
-        'access_features': str,
-        'nearby_amenities': str
-    })
-    return df
+    return columnar_data.load_properties(property_file)
+
+@st.cache_resource
+def get_matcher(properties_df):
+    """Matcher over the loaded properties, built once per data load."""
+    return AccommodationMatcher(properties_df)
+
+@st.cache_resource
+def get_match_cache():
+    """Ranked results shared across reruns, so resubmitting a form is instant."""
+    return MatchCache(maxsize=128, ttl=900)
 
 def display_results(results, household):
     """Display matching results."""
@@ -444,8 +446,7 @@ if properties_df is not None:
                 # Run matching button
                 if st.button("🔍 Find Suitable Accommodation", key="voice_match_button"):
                     with st.spinner("Matching household to properties..."):
-                        matcher = AccommodationMatcher(properties_df)
-                        results = matcher.match_household(household_display)
+                        results = get_match_cache().match(get_matcher(properties_df), household_display)
                         st.session_state['match_results'] = results
                         st.session_state['show_results'] = True
                 
@@ -569,8 +570,7 @@ if properties_df is not None:
                 
                 # Run matching
                 with st.spinner("Matching household to suitable properties..."):
-                    matcher = AccommodationMatcher(properties_df)
-                    results = matcher.match_household(household)
+                    results = get_match_cache().match(get_matcher(properties_df), household)
                 
                 # Display results
                 display_results(results, household)
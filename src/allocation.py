@@ -0,0 +1,105 @@
+"""
+Cohort allocation of households to temporary accommodation.
+
+match_household ranks properties for one household in isolation, so several
+urgent households can all be recommended the same unit. This module assigns
+a whole cohort at once: each property goes to at most one household and the
+total urgency-weighted match score is maximised.
+
+The assignment is solved with the Hungarian algorithm
+(scipy.optimize.linear_sum_assignment). Every household also gets a private
+"unplaced" option with zero benefit, so nobody is forced into a property
+that fails a hard constraint (too few beds, over budget, or an unmet
+wheelchair/ground floor need).
+"""
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+from typing import Dict
+
+from household_profile import compile_household
+from match_results import EMERGENCY_LIMIT_DAYS
+
+# Multiplier applied to match scores by priority need level
+PRIORITY_WEIGHTS: Dict[str, float] = {
+    'Low': 1.0,
+    'Medium': 1.25,
+    'High': 1.5,
+    'Critical': 2.0,
+}
+
+# Cost given to forbidden pairs; far above any achievable benefit
+_FORBIDDEN = 1e9
+
+
+def urgency_weight(length_of_placement: int, priority_need: str) -> float:
+    """
+    Urgency multiplier for a household.
+
+    Rises linearly from 1.0 on day 0 to 2.0 at the 42-day limit and keeps
+    rising (capped at 3.0) once the limit is exceeded, then is scaled by
+    the priority need level.
+    """
+    days = max(int(length_of_placement), 0)
+    days_factor = 1.0 + min(days / EMERGENCY_LIMIT_DAYS, 2.0)
+    return days_factor * PRIORITY_WEIGHTS.get(str(priority_need), 1.0)
+
+
+def allocate(matcher, households_df: pd.DataFrame, chunk_size: int = 256) -> pd.DataFrame:
+    """
+    Assign a cohort of households to properties in one optimisation.
+
+    Args:
+        matcher: AccommodationMatcher holding the available properties
+        households_df: Households to place, one per row
+        chunk_size: Households scored per block while building the cost matrix
+
+    Returns:
+        DataFrame with one row per household, most urgent first, with columns
+        household_id, property_id (None if unplaced), overall_score and
+        urgency_weight
+    """
+    profiles = [compile_household(h) for h in households_df.to_dict('records')]
+    if not profiles:
+        return pd.DataFrame(columns=['household_id', 'property_id', 'overall_score', 'urgency_weight'])
+    urgency = np.array([
+        urgency_weight(p.length_of_placement, p.priority_need) for p in profiles
+    ])
+
+    # Urgency-weighted benefit of each pair; infeasible pairs are forbidden
+    household_ids, costs, scores = [], [], []
+    for cohort in matcher.iter_match_many(profiles, chunk_size):
+        feasible = (
+            (cohort.components['bedroom_suitability'] > 0)
+            & (cohort.components['affordability'] > 0)
+            & (cohort.components['access_needs'] > 0)
+        )
+        weights = urgency[len(household_ids):len(household_ids) + len(cohort.household_ids)]
+        costs.append(np.where(feasible, -cohort.scores * weights[:, None], _FORBIDDEN))
+        scores.append(cohort.scores)
+        household_ids.extend(cohort.household_ids)
+    cost = np.vstack(costs)
+    scores = np.vstack(scores)
+
+    # Only properties feasible for someone take part, plus one zero-benefit
+    # "unplaced" column per household
+    wanted = np.flatnonzero((cost < _FORBIDDEN).any(axis=0))
+    n_households = len(profiles)
+    unplaced = np.full((n_households, n_households), _FORBIDDEN)
+    np.fill_diagonal(unplaced, 0.0)
+    rows, cols = linear_sum_assignment(np.hstack([cost[:, wanted], unplaced]))
+
+    placed = {row: wanted[col] for row, col in zip(rows, cols) if col < len(wanted)}
+    allocation = pd.DataFrame({
+        'household_id': household_ids,
+        'property_id': [
+            cohort.property_ids[placed[i]] if i in placed else None
+            for i in range(n_households)
+        ],
+        'overall_score': [
+            float(scores[i, placed[i]]) if i in placed else 0.0
+            for i in range(n_households)
+        ],
+        'urgency_weight': urgency,
+    })
+    return allocation.sort_values('urgency_weight', ascending=False, kind='stable')
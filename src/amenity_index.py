@@ -0,0 +1,126 @@
+"""
+Amenity proximity index.
+
+Instead of the hand-typed nearby_amenities text, amenities can be given as a
+point layer: one row per school, clinic, job centre, etc. with its type and
+coordinates. For every property with coordinates the index keeps the
+distance to the nearest amenity of each type in a compact float32 array,
+precomputed once with a BallTree per type.
+
+A property counts as having an amenity nearby when the nearest one of that
+type is within radius_km. That gives the same amenity bitset the matcher
+already scores (see feature_encoding), so amenity scoring stays an array
+lookup. Adding an amenity updates only the properties it is now nearest to,
+found with a radius query on a SpatialIndex of the properties: no property
+can gain a nearer amenity farther away than the current worst nearest
+distance of that type.
+"""
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import BallTree
+from typing import Dict, Optional
+
+from feature_encoding import AMENITY_FEATURES, BITSET_DTYPE
+from growable import grow
+from spatial_index import EARTH_RADIUS_KM, SpatialIndex, haversine_km
+
+# Amenity types, one per amenity feature keyword. GP surgeries count as
+# 'clinic', primary and secondary schools as 'primary' and 'secondary'.
+AMENITY_TYPES = list(AMENITY_FEATURES)
+
+# Distance within which an amenity counts as nearby
+AMENITY_RADIUS_KM = 1.0
+
+
+class AmenityIndex:
+    """Nearest distance from each property to each type of amenity."""
+
+    def __init__(self, property_coordinates: np.ndarray,
+                 amenities: Optional[pd.DataFrame] = None,
+                 radius_km: float = AMENITY_RADIUS_KM):
+        """
+        Args:
+            property_coordinates: (latitude, longitude) per property position,
+                NaN where unknown
+            amenities: DataFrame with amenity_type (one of AMENITY_TYPES),
+                latitude and longitude columns
+            radius_km: Distance within which an amenity counts as nearby
+        """
+        self.radius_km = radius_km
+        self._coordinates = np.array(property_coordinates, dtype=np.float64).reshape(-1, 2)
+        self._points: Dict[str, np.ndarray] = {t: np.zeros((0, 2)) for t in AMENITY_TYPES}
+        # Nearest distance in km, properties x AMENITY_TYPES; inf when unknown
+        self.distances = np.full((len(self._coordinates), len(AMENITY_TYPES)), np.inf, dtype=np.float32)
+        # Upper bound on the nearest distance of any located property, per type
+        self._reach = np.full(len(AMENITY_TYPES), np.inf)
+        self._spatial = SpatialIndex(self._coordinates)
+        if amenities is not None:
+            self._load(amenities)
+
+    def _load(self, amenities: pd.DataFrame):
+        """Precompute distances for a whole amenity layer."""
+        unknown = set(amenities['amenity_type']) - set(AMENITY_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown amenity types {sorted(unknown)}; expected {AMENITY_TYPES}")
+        located = np.flatnonzero(~np.isnan(self._coordinates).any(axis=1))
+        for j, amenity_type in enumerate(AMENITY_TYPES):
+            rows = amenities[amenities['amenity_type'] == amenity_type]
+            points = rows[['latitude', 'longitude']].to_numpy(dtype=np.float64)
+            self._points[amenity_type] = points
+            if not len(points) or not len(located):
+                continue
+            tree = BallTree(np.radians(points), metric='haversine')
+            distance, _ = tree.query(np.radians(self._coordinates[located]), k=1)
+            self.distances[located, j] = distance[:, 0] * EARTH_RADIUS_KM
+            self._reach[j] = self.distances[located, j].max()
+
+    def _ensure_capacity(self, position: int):
+        """Grow the per-property arrays (by doubling) to hold position."""
+        self._coordinates = grow(self._coordinates, position, np.nan)
+        self.distances = grow(self.distances, position, np.inf)
+
+    def add_amenity(self, amenity_type: str, latitude: float, longitude: float) -> np.ndarray:
+        """
+        Add one amenity and update the properties it is now nearest to.
+
+        Returns:
+            Positions whose distance to this amenity type changed
+        """
+        if amenity_type not in AMENITY_TYPES:
+            raise ValueError(f"Unknown amenity type {amenity_type!r}; expected {AMENITY_TYPES}")
+        j = AMENITY_TYPES.index(amenity_type)
+        self._points[amenity_type] = np.vstack([self._points[amenity_type], [[latitude, longitude]]])
+        if np.isinf(self._reach[j]):
+            # Some property has no amenity of this type yet: measure them all
+            located = np.flatnonzero(~np.isnan(self._coordinates).any(axis=1))
+            distances = haversine_km(latitude, longitude, self._coordinates[located])
+            candidates = located
+        else:
+            candidates, distances = self._spatial.within(latitude, longitude, self._reach[j])
+        distances = distances.astype(np.float32)
+        nearer = distances < self.distances[candidates, j]
+        affected = np.sort(candidates[nearer])
+        self.distances[candidates[nearer], j] = distances[nearer]
+        if np.isinf(self._reach[j]) and len(candidates):
+            self._reach[j] = self.distances[candidates, j].max()
+        return affected
+
+    def set_property(self, position: int, latitude: float, longitude: float):
+        """Compute distances for a new or moved property."""
+        self._ensure_capacity(position)
+        self._coordinates[position] = (latitude, longitude)
+        self._spatial.add(position, latitude, longitude)
+        self.distances[position] = np.inf
+        if np.isnan(latitude) or np.isnan(longitude):
+            return
+        for j, amenity_type in enumerate(AMENITY_TYPES):
+            points = self._points[amenity_type]
+            if len(points):
+                self.distances[position, j] = haversine_km(latitude, longitude, points).min()
+        self._reach = np.maximum(self._reach, self.distances[position])
+
+    def bits(self, positions: np.ndarray) -> np.ndarray:
+        """Amenity bitsets (see feature_encoding) for properties, from nearby amenities."""
+        nearby = self.distances[positions] <= self.radius_km
+        masks = np.array([AMENITY_FEATURES[t] for t in AMENITY_TYPES], dtype=BITSET_DTYPE)
+        return np.bitwise_or.reduce(np.where(nearby, masks, 0).astype(BITSET_DTYPE), axis=1)
@@ -0,0 +1,149 @@
+"""
+Availability-window index for time-aware matching.
+
+Properties may carry available_from / available_until dates. A missing start
+means the unit is available now and a missing end that it stays available.
+The index answers "which units are available at some point between D and
+D+n" in O(log n + k):
+
+- units whose window starts inside (D, D+n] are a contiguous run of an
+  array of start days kept sorted
+- units whose window contains D are found by a stabbing query on a centered
+  interval tree, whose nodes keep their intervals in sorted arrays
+
+New or changed windows are checked directly until the sorted starts and
+the tree are next rebuilt (see growable.DeferredRebuild).
+"""
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Optional
+
+from growable import DeferredRebuild, grow
+
+# Day numbers standing in for an open start or end
+OPEN_START = np.iinfo(np.int64).min
+OPEN_END = np.iinfo(np.int64).max
+
+# Intervals kept in a leaf instead of being split further
+_LEAF_SIZE = 32
+
+
+def to_days(values: Iterable, missing: int) -> np.ndarray:
+    """Dates as int64 days since 1970-01-01, with missing for blanks."""
+    dates = pd.to_datetime(pd.Series(list(values), dtype=object), errors='coerce')
+    days = dates.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    return np.where(dates.isna().to_numpy(), missing, days)
+
+
+def day_number(value) -> int:
+    """One date (date, datetime or ISO string) as days since 1970-01-01."""
+    return int(pd.Timestamp(value).to_datetime64().astype('datetime64[D]').astype(np.int64))
+
+
+class _Node:
+    """Interval tree node; a leaf when center is None."""
+
+    def __init__(self, positions: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+        self.left = self.right = None
+        self.center = None
+        self.positions, self.starts, self.ends = positions, starts, ends
+        if len(positions) <= _LEAF_SIZE:
+            return
+
+        # Median of the finite endpoints splits the intervals roughly in half
+        endpoints = np.concatenate([starts[starts != OPEN_START], ends[ends != OPEN_END]])
+        center = int(np.median(endpoints)) if len(endpoints) else 0
+        here = (starts <= center) & (ends >= center)
+        left = ends < center
+        right = starts > center
+        if left.all() or right.all():
+            return
+        self.center = center
+
+        by_start = np.argsort(starts[here], kind='stable')
+        self.start_positions = positions[here][by_start]
+        self.start_days = starts[here][by_start]
+        by_end = np.argsort(-ends[here], kind='stable')
+        self.end_positions = positions[here][by_end]
+        self.end_days = -ends[here][by_end]
+        if left.any():
+            self.left = _Node(positions[left], starts[left], ends[left])
+        if right.any():
+            self.right = _Node(positions[right], starts[right], ends[right])
+
+    def stab(self, day: int, found: List[np.ndarray]):
+        """Append the positions of intervals containing day."""
+        node = self
+        while node is not None:
+            if node.center is None:
+                found.append(node.positions[(node.starts <= day) & (node.ends >= day)])
+                return
+            if day <= node.center:
+                found.append(node.start_positions[:np.searchsorted(node.start_days, day, side='right')])
+                node = node.left
+            else:
+                found.append(node.end_positions[:np.searchsorted(node.end_days, -day, side='right')])
+                node = node.right
+
+
+class AvailabilityIndex(DeferredRebuild):
+    """Find properties whose availability window overlaps a date range."""
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray):
+        """
+        Args:
+            starts: First available day per property position (OPEN_START if now)
+            ends: Last available day per property position (OPEN_END if open)
+        """
+        self._starts = np.array(starts, dtype=np.int64)
+        self._ends = np.array(ends, dtype=np.int64)
+        # A window ending before it starts is never available
+        self._live = self._starts <= self._ends
+        self._build()
+
+    def _build(self):
+        """(Re)build the sorted starts and the interval tree over live positions."""
+        positions = np.flatnonzero(self._live)
+        order = np.argsort(self._starts[positions], kind='stable')
+        self._by_start = positions[order]
+        self._sorted_starts = self._starts[self._by_start]
+        self._tree = _Node(positions, self._starts[positions], self._ends[positions])
+        self._in_tree = self._live.copy()
+        self._reset_pending()
+
+    def _ensure_capacity(self, position: int):
+        """Grow the per-position columns (by doubling) to hold position."""
+        for name in ('_starts', '_ends', '_live', '_in_tree'):
+            setattr(self, name, grow(getattr(self, name), position))
+
+    def add(self, position: int, start: int = OPEN_START, end: int = OPEN_END):
+        """Index (or re-index) the availability window of the property at position."""
+        self.remove(position)
+        self._ensure_capacity(position)
+        self._starts[position] = start
+        self._ends[position] = end
+        if start > end:
+            return
+        self._queue(position, len(self._by_start))
+
+    def overlapping(self, start: int, end: Optional[int] = None) -> np.ndarray:
+        """
+        Sorted positions of properties available at some day in [start, end].
+
+        Args:
+            start: First day of the range
+            end: Last day of the range (default: start)
+        """
+        end = start if end is None else end
+        found = [np.array([], dtype=np.intp)]
+        self._tree.stab(start, found)
+        found.append(self._by_start[
+            np.searchsorted(self._sorted_starts, start, side='right'):
+            np.searchsorted(self._sorted_starts, end, side='right')
+        ])
+        positions = np.concatenate(found)
+        positions = positions[self._in_tree[positions]]
+
+        pending = self._pending_positions()
+        pending = pending[(self._starts[pending] <= end) & (self._ends[pending] >= start)]
+        return np.union1d(positions, pending)
@@ -0,0 +1,133 @@
+"""
+Multi-core batch matching of a whole caseload.
+
+The overnight re-match scores every open case against the full property
+stock. This module shards households across a ProcessPoolExecutor. The
+property store's arrays are published once through
+multiprocessing.shared_memory, and each worker builds its matcher as a
+read-only view over them instead of unpickling its own copy of the stock.
+
+Workers run the same AccommodationMatcher.match_household code over the
+same arrays and send back only the compact RankedMatches arrays, which the
+parent rebinds to its own store, so results are identical to serial matching.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from match_results import RankedMatches
+from matching_engine import AccommodationMatcher
+from property_store import PropertyStore
+
+# Matcher built in each worker process by _init_worker
+_worker_matcher = None
+_worker_blocks = []
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to a block published by the parent process."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: pool workers share the parent's resource tracker, so
+        # the duplicate registration is harmless and the parent unlinks
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedPropertyArrays:
+    """
+    A PropertyStore published in shared memory.
+
+    Use as a context manager; the shared blocks are released on exit.
+    """
+
+    def __init__(self, store: PropertyStore):
+        arrays, self.header = store.export_arrays()
+        self.layout = {}
+        self._blocks = []
+        for key, array in arrays.items():
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.layout[key] = (block.name, array.dtype.str, array.shape)
+
+    @staticmethod
+    def attach(layout: Dict, header: Dict):
+        """Rebuild a read-only PropertyStore over published blocks."""
+        blocks, arrays = [], {}
+        for key, (name, dtype, shape) in layout.items():
+            block = _attach(name)
+            blocks.append(block)
+            arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        return PropertyStore.from_arrays(arrays, header), blocks
+
+    def close(self):
+        """Release and remove the shared blocks."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _init_worker(layout: Dict, header: Dict):
+    """Build this worker's matcher over the shared property arrays."""
+    global _worker_matcher, _worker_blocks
+    store, _worker_blocks = SharedPropertyArrays.attach(layout, header)
+    _worker_matcher = AccommodationMatcher(store)
+
+
+def _match_shard(households: List[Dict], top_k: Optional[int], feasible_only: bool):
+    """Match one shard of households in a worker, returning RankedMatches arrays."""
+    return [
+        _worker_matcher.match_household(h, top_k=top_k, feasible_only=feasible_only).arrays()
+        for h in households
+    ]
+
+
+def match_caseload(properties: Union[pd.DataFrame, PropertyStore],
+                   households_df: pd.DataFrame,
+                   workers: Optional[int] = None,
+                   top_k: Optional[int] = None,
+                   feasible_only: bool = False,
+                   shard_size: int = 64) -> List[RankedMatches]:
+    """
+    Match every household in parallel.
+
+    Args:
+        properties: Property DataFrame or PropertyStore
+        households_df: Households to match, one per row
+        workers: Worker processes (default: one per CPU)
+        top_k: Passed to match_household
+        feasible_only: Passed to match_household
+        shard_size: Households sent to a worker per task
+
+    Returns:
+        One RankedMatches per household, in households_df order - exactly
+        what match_household returns for each
+    """
+    store = properties if isinstance(properties, PropertyStore) else PropertyStore.from_dataframe(properties)
+    households = households_df.to_dict('records')
+    shards = [households[i:i + shard_size] for i in range(0, len(households), shard_size)]
+    workers = workers or os.cpu_count() or 1
+
+    with SharedPropertyArrays(store) as shared:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(shared.layout, shared.header)
+        ) as pool:
+            futures = [pool.submit(_match_shard, shard, top_k, feasible_only) for shard in shards]
+            return [
+                RankedMatches(store, **arrays)
+                for future in futures for arrays in future.result()
+            ]
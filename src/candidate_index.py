@@ -0,0 +1,214 @@
+"""
+Hard-constraint candidate index for the matching engine.
+
+Some household-property pairs can never be suitable, whatever their other
+scores:
+- Fewer beds than the household requires (bedroom score 0)
+- Rent above the household budget (affordability score 0)
+- Wheelchair or ground floor need the property cannot meet (access score 0)
+
+The index groups properties into buckets keyed on (location, beds), each
+holding property positions sorted by rent. A query visits only the buckets
+with enough beds, binary-searches the rent limit and then checks access, so
+unsuitable properties are never touched.
+
+The buckets double as partitions for bounded top-k search: every property
+in a bucket shares a location and bed count, so those component scores are
+known for the whole bucket before any of it is scored.
+
+Properties can be added, updated and withdrawn without a rebuild. New
+entries go to a small unsorted pending list per bucket that is merged into
+the sorted arrays once it grows past a fraction of the bucket, so updates
+cost amortised O(1) (see growable). Withdrawn or moved entries are left in place and
+filtered out against the current per-position columns, then dropped at the
+next merge.
+"""
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from feature_encoding import ACCESS_FEATURES, BITSET_DTYPE, feature_mask, has_any
+from growable import grow, needs_rebuild
+from property_store import as_rent
+
+
+class _Bucket:
+    """Positions of one (location, beds) group, sorted by rent."""
+
+    def __init__(self, rents: np.ndarray, positions: np.ndarray):
+        self.rents = rents
+        self.positions = positions
+        self.pending: List[int] = []
+
+    def within(self, budget: float) -> np.ndarray:
+        """Positions whose indexed rent is within budget, plus all pending ones."""
+        found = self.positions[:np.searchsorted(self.rents, as_rent(budget), side='right')]
+        if self.pending:
+            found = np.concatenate([found, np.array(self.pending, dtype=found.dtype)])
+        return found
+
+
+class CandidateIndex:
+    """Find properties that satisfy a household's hard constraints."""
+
+    def __init__(self, location_codes: np.ndarray, beds: np.ndarray, rents: np.ndarray,
+                 access_bits: np.ndarray):
+        """
+        Build the index from per-property columns.
+
+        Args:
+            location_codes: Integer location category per property
+            beds: Number of beds per property
+            rents: Monthly rent per property
+            access_bits: Access feature bitsets (see feature_encoding)
+        """
+        n = len(beds)
+
+        # Current value of every indexed column, by position
+        self._locations = np.array(location_codes, dtype=np.int64)
+        self._beds = np.array(beds, dtype=np.int64)
+        self._rents = np.array(rents, dtype=np.float64)
+        self._access_bits = np.array(access_bits, dtype=BITSET_DTYPE)
+        self._live = np.ones(n, dtype=bool)
+
+        self._buckets: Dict[Tuple[int, int], _Bucket] = {}
+        order = np.lexsort((self._rents, self._beds, self._locations))
+        keys = list(zip(self._locations[order].tolist(), self._beds[order].tolist()))
+        start = 0
+        for end in range(1, n + 1):
+            if end == n or keys[end] != keys[start]:
+                positions = order[start:end]
+                self._buckets[keys[start]] = _Bucket(self._rents[positions], positions)
+                start = end
+
+    def _ensure_capacity(self, position: int):
+        """Grow the per-position columns (by doubling) to hold position."""
+        for name in ('_locations', '_beds', '_rents', '_access_bits', '_live'):
+            setattr(self, name, grow(getattr(self, name), position))
+
+    def add(self, position: int, location_code: int, beds: int, rent: float, access_bits: int):
+        """Index (or re-index) the property at position."""
+        self._ensure_capacity(position)
+        code = int(location_code)
+        self._locations[position] = code
+        self._beds[position] = beds
+        self._rents[position] = rent
+        self._access_bits[position] = access_bits
+        self._live[position] = True
+
+        key = (code, int(beds))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _Bucket(
+                np.array([], dtype=np.float64), np.array([], dtype=np.intp)
+            )
+        bucket.pending.append(position)
+        if needs_rebuild(len(bucket.pending), len(bucket.positions)):
+            self._merge(key, bucket)
+
+    def remove(self, position: int):
+        """Drop the property at position from future results."""
+        if position < len(self._live):
+            self._live[position] = False
+
+    def _merge(self, key: Tuple[int, int], bucket: _Bucket):
+        """Fold pending entries into the sorted arrays, dropping stale ones."""
+        positions = np.unique(np.concatenate([
+            bucket.positions, np.array(bucket.pending, dtype=np.intp)
+        ]))
+        current = (
+            self._live[positions]
+            & (self._locations[positions] == key[0])
+            & (self._beds[positions] == key[1])
+        )
+        positions = positions[current]
+        order = np.argsort(self._rents[positions], kind='stable')
+        bucket.positions = positions[order]
+        bucket.rents = self._rents[bucket.positions]
+        bucket.pending = []
+
+    def partitions(self) -> List[Tuple[int, int, float]]:
+        """
+        (location_code, beds, min_rent) of every bucket.
+
+        min_rent is a lower bound on the rent of the bucket's current members
+        (entries left behind by updates can make it lower than the true minimum).
+        """
+        found = []
+        for (location, beds), bucket in self._buckets.items():
+            # Sorted rents put NaN last; a NaN member makes the minimum NaN,
+            # which never compares as over budget
+            rents = np.concatenate([bucket.rents[:1], bucket.rents[-1:], self._rents[bucket.pending]])
+            if len(rents):
+                found.append((location, beds, float(np.min(rents))))
+        return found
+
+    def partition(self, location_code: int, beds: int, budget: Optional[float] = None,
+                  access_requirement: str = 'none') -> np.ndarray:
+        """
+        Sorted positions of the current members of one bucket.
+
+        With a budget, only members that also meet the budget and any
+        critical access requirement are returned, as in candidates.
+        """
+        bucket = self._buckets.get((location_code, beds))
+        if bucket is None:
+            return np.array([], dtype=np.intp)
+        positions = np.unique(np.concatenate([
+            bucket.positions, np.array(bucket.pending, dtype=np.intp)
+        ]))
+        keep = (
+            self._live[positions]
+            & (self._locations[positions] == location_code)
+            & (self._beds[positions] == beds)
+        )
+        if budget is not None:
+            keep &= self._feasible(positions, budget, access_requirement)
+        return positions[keep]
+
+    def _feasible(self, positions: np.ndarray, budget: float, access_requirement: str) -> np.ndarray:
+        """Mask of positions within budget that meet a critical access requirement."""
+        keep = ~(self._rents[positions] > as_rent(budget))
+        if access_requirement == 'wheelchair':
+            keep &= has_any(self._access_bits[positions], ACCESS_FEATURES['wheelchair'])
+        elif access_requirement == 'ground floor':
+            keep &= has_any(
+                self._access_bits[positions], feature_mask(('ground floor', 'lift'), ACCESS_FEATURES)
+            )
+        return keep
+
+    def candidates(self, required_beds: int, budget: float,
+                   access_requirement: str = 'none',
+                   area_codes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Positions of properties that meet the hard constraints.
+
+        Args:
+            required_beds: Minimum number of beds
+            budget: Maximum monthly rent
+            access_requirement: One of AccommodationMatcher.ACCESS_REQUIREMENTS;
+                'wheelchair' and 'ground floor' are mandatory needs
+            area_codes: Optional location codes; restricts the search to those areas
+
+        Returns:
+            Sorted array of property positions
+        """
+        areas = None if area_codes is None else set(int(c) for c in area_codes)
+        found = [
+            bucket.within(budget)
+            for (location, beds), bucket in self._buckets.items()
+            if beds >= required_beds and (areas is None or location in areas)
+        ]
+        if not found:
+            return np.array([], dtype=np.intp)
+        positions = np.unique(np.concatenate(found))
+
+        # Entries left behind by updates or withdrawals are checked against
+        # the current columns
+        keep = (
+            self._live[positions]
+            & (self._beds[positions] >= required_beds)
+            & self._feasible(positions, budget, access_requirement)
+        )
+        if areas is not None:
+            keep &= np.isin(self._locations[positions], list(areas))
+        return positions[keep]
@@ -0,0 +1,198 @@
+"""
+Columnar copies of the property and household tables.
+
+Parsing property_data.csv is the main startup cost once the stock is large.
+This module converts the CSV files to Arrow IPC files, which are
+uncompressed and column-oriented, so they can be memory-mapped and read
+without parsing. Only the columns the matcher needs are materialised.
+Repeated text columns are stored dictionary-encoded and load as pandas
+categoricals; load_properties also downcasts numbers and parses the feature
+columns into bitsets (see typed_properties).
+
+pyarrow is optional. Without it, or when no up-to-date columnar file
+exists, the loaders fall back to reading the CSV (still limited to the
+needed columns).
+
+Convert the sample data with:
+    python src/columnar_data.py
+"""
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from feature_encoding import ACCESS_FEATURES, AMENITY_FEATURES, encode_features
+from household_profile import ANCHOR_FIELDS
+from match_results import PROPERTY_FIELDS
+from property_store import (
+    BITSET_COLUMNS, CATEGORICAL_COLUMNS, COORDINATE_COLUMNS, NUMERIC_COLUMNS, as_rent
+)
+
+# Optional columnar file support
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Suffix of the columnar copy kept next to each CSV file
+COLUMNAR_SUFFIX = '.arrow'
+
+# Text columns that must not be parsed as numbers
+PROPERTY_DTYPES: Dict[str, type] = {
+    'property_id': str,
+    'location': str,
+    'neighbour_quality': str,
+    'tenure_length': str,
+    'access_features': str,
+    'nearby_amenities': str
+}
+HOUSEHOLD_DTYPES: Dict[str, type] = {
+    'household_id': str,
+    'area_restrictions': str,
+    'access_needs': str,
+    'schools': str,
+    'employment': str,
+    'health_social_network': str
+}
+
+# "None" is a real answer in household text fields (e.g. no access needs),
+# so only empty cells count as missing
+HOUSEHOLD_NA_OPTIONS = {'keep_default_na': False, 'na_values': ['']}
+
+# Columns read by the matcher; optional ones are used when the file has them
+PROPERTY_COLUMNS: List[str] = PROPERTY_FIELDS + COORDINATE_COLUMNS + ['available_from', 'available_until']
+HOUSEHOLD_COLUMNS: List[str] = [
+    'household_id', 'eligibility_pre_screen', 'area_restrictions', 'priority_need',
+    'intentional_homeless', 'eligibility', 'length_of_placement', 'access_needs',
+    'schools', 'employment', 'health_social_network', 'affordability', 'household_composition'
+] + ANCHOR_FIELDS
+
+# Keywords encoded into each bitset column
+FEATURES = {'access_features': ACCESS_FEATURES, 'nearby_amenities': AMENITY_FEATURES}
+
+PathLike = Union[str, Path]
+
+
+def columnar_path(csv_path: PathLike) -> Path:
+    """Path of the columnar copy of a CSV file."""
+    return Path(csv_path).with_suffix(COLUMNAR_SUFFIX)
+
+
+def convert_to_columnar(csv_path: PathLike, dtype: Optional[Dict[str, type]] = None,
+                        categorical: Optional[List[str]] = None, **read_options) -> Path:
+    """
+    Write the columnar copy of a CSV file.
+
+    Args:
+        csv_path: CSV file to convert
+        dtype: Column dtypes for read_csv (e.g. PROPERTY_DTYPES)
+        categorical: Text columns to store dictionary-encoded
+        read_options: Further read_csv options (e.g. HOUSEHOLD_NA_OPTIONS)
+
+    Returns:
+        Path of the written file
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for columnar files: pip install pyarrow")
+    df = pd.read_csv(csv_path, dtype=dtype, **read_options)
+    for name in categorical or []:
+        if name in df.columns:
+            df[name] = df[name].astype('category')
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    path = columnar_path(csv_path)
+    with pa.OSFile(str(path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return path
+
+
+def read_columnar(path: PathLike, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a columnar file through a memory map.
+
+    Args:
+        path: Arrow IPC file written by convert_to_columnar
+        columns: Columns to materialise (missing ones are skipped); default all
+    """
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for columnar files: pip install pyarrow")
+    with pa.memory_map(str(path), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            table = table.select([name for name in columns if name in table.column_names])
+        return table.to_pandas()
+
+
+def _load(csv_path: PathLike, columns: List[str], dtype: Dict[str, type],
+          **read_options) -> pd.DataFrame:
+    """Read the needed columns, from the columnar copy when it is up to date."""
+    csv_path = Path(csv_path)
+    columnar = columnar_path(csv_path)
+    if PYARROW_AVAILABLE and columnar.exists() and (
+        not csv_path.exists() or columnar.stat().st_mtime >= csv_path.stat().st_mtime
+    ):
+        return read_columnar(columnar, columns)
+    wanted = set(columns)
+    return pd.read_csv(csv_path, dtype=dtype, usecols=lambda name: name in wanted, **read_options)
+
+
+def typed_properties(properties_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    A property table in the compact types the matcher stores.
+
+    - repeated text (CATEGORICAL_COLUMNS) as pandas categoricals
+    - beds, rooms and rent downcast to the NUMERIC_COLUMNS dtypes (a
+      column with missing numbers stays floating point)
+    - access and amenity features also parsed into the bitset columns of
+      BITSET_COLUMNS, which PropertyStore.from_dataframe uses as they are
+    """
+    typed = {}
+    for name, column in properties_df.items():
+        if name in CATEGORICAL_COLUMNS and not isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype('category')
+        elif name == 'affordability':
+            # Same precision as the store, so budgets compare alike (see as_rent)
+            column = pd.Series(as_rent(pd.to_numeric(column)), index=properties_df.index, name=name)
+        elif name in NUMERIC_COLUMNS:
+            column = pd.to_numeric(column)
+            dtype = NUMERIC_COLUMNS[name]
+            column = column.astype(np.float32 if column.isna().any() else dtype)
+        typed[name] = column
+    for name, bitset in BITSET_COLUMNS.items():
+        if name in typed:
+            typed[bitset] = pd.Series(
+                encode_features(typed[name], FEATURES[name]), index=properties_df.index
+            )
+    return pd.DataFrame(typed)
+
+
+def load_properties(csv_path: PathLike = 'data/property_data.csv') -> pd.DataFrame:
+    """Property table with the columns the matcher uses, in compact types (see typed_properties)."""
+    dtype = dict(PROPERTY_DTYPES, **{name: 'category' for name in CATEGORICAL_COLUMNS})
+    return typed_properties(_load(csv_path, PROPERTY_COLUMNS, dtype))
+
+
+def load_households(csv_path: PathLike = 'data/household_data.csv') -> pd.DataFrame:
+    """Household table with the columns the matcher and eligibility checks use."""
+    return _load(csv_path, HOUSEHOLD_COLUMNS, HOUSEHOLD_DTYPES, **HOUSEHOLD_NA_OPTIONS)
+
+
+def data_available(csv_path: PathLike) -> bool:
+    """True if a CSV file or its columnar copy exists."""
+    return Path(csv_path).exists() or (PYARROW_AVAILABLE and columnar_path(csv_path).exists())
+
+
+if __name__ == '__main__':
+    if not PYARROW_AVAILABLE:
+        sys.exit("pyarrow is not installed: pip install pyarrow")
+    data_dir = Path('data')
+    for csv_file, dtype, categorical, read_options in [
+        (data_dir / 'property_data.csv', PROPERTY_DTYPES, CATEGORICAL_COLUMNS, {}),
+        (data_dir / 'household_data.csv', HOUSEHOLD_DTYPES, ['area_restrictions', 'priority_need'],
+         HOUSEHOLD_NA_OPTIONS),
+    ]:
+        print(f"✓ Created {convert_to_columnar(csv_file, dtype, categorical, **read_options)}")
@@ -0,0 +1,73 @@
+"""
+Compact bitset encoding of free-text property features.
+
+The access_features and nearby_amenities columns are comma lists typed by
+hand ("Wheelchair accessible, Lift"). The matching engine only ever asks
+whether a keyword occurs in that text, so each column is parsed once into
+an integer bitset with one bit per keyword. Scoring is then a bitwise AND
+over a whole column instead of substring searches per household-property
+pair.
+
+Keywords are matched as lower-case substrings, exactly like the scalar
+score_* methods in matching_engine.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable
+
+# Access keywords checked by score_access_needs
+ACCESS_FEATURES: Dict[str, int] = {
+    'wheelchair': 1 << 0,
+    'ground floor': 1 << 1,
+    'lift': 1 << 2,
+}
+
+# Amenity keywords checked by score_amenities
+AMENITY_FEATURES: Dict[str, int] = {
+    'primary': 1 << 0,
+    'secondary': 1 << 1,
+    'mental health': 1 << 2,
+    'clinic': 1 << 3,
+    'hospital': 1 << 4,
+    'disability': 1 << 5,
+    'substance': 1 << 6,
+    'job centre': 1 << 7,
+}
+
+# Integer type used to store a bitset per property
+BITSET_DTYPE = np.uint16
+
+
+def encode_text(value, features: Dict[str, int]) -> int:
+    """Bitset of the feature keywords found in one free-text value."""
+    text = str(value).lower()
+    bits = 0
+    for keyword, bit in features.items():
+        if keyword in text:
+            bits |= bit
+    return bits
+
+
+def encode_features(values: Iterable, features: Dict[str, int]) -> np.ndarray:
+    """
+    Encode a column of free-text values as an array of bitsets.
+
+    Each distinct value is parsed only once, since stock data repeats the
+    same few feature lists many times.
+    """
+    codes, distinct = pd.factorize(pd.Series(list(values), dtype=object), use_na_sentinel=False)
+    table = np.array([encode_text(value, features) for value in distinct], dtype=BITSET_DTYPE)
+    return table[codes]
+
+
+def feature_mask(keywords: Iterable[str], features: Dict[str, int]) -> int:
+    """Combined bit mask of the given keywords."""
+    mask = 0
+    for keyword in keywords:
+        mask |= features[keyword]
+    return mask
+
+
+def has_any(bitsets: np.ndarray, mask: int) -> np.ndarray:
+    """True where a bitset shares at least one bit with mask."""
+    return (bitsets & BITSET_DTYPE(mask)) != 0
@@ -1,11 +1,24 @@
 """
 Generate dummy CSV data for households and properties.
 This script creates realistic test data reflecting UK homelessness context.
+
+Run without arguments to write the 7 sample households and 15 sample
+properties. For load testing, give table sizes and a seed to generate
+synthetic data at scale, e.g.:
+    python src/generate_data.py --households 100000 --properties 1000000 --seed 42
+
+Synthetic rows are drawn vectorized from distributions modelled on the
+sample data and written in chunks, so memory stays flat whatever the size.
+Output is CSV by default, or Parquet / Arrow IPC with --format (needs pyarrow).
 """
+import argparse
 import csv
 import random
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 def generate_household_data():
     """Generate dummy household data with realistic variation."""
     
@@ -342,6 +355,201 @@ def save_to_csv():
             writer.writerows(properties)
         print(f"✓ Created {property_file} with {len(properties)} properties")
 
+# Value pools and probabilities for synthetic data
+AREAS = ['North London', 'East London', 'South London', 'West London', 'Central London']
+AREA_WEIGHTS = [0.22, 0.26, 0.22, 0.18, 0.12]
+AREA_RENT_OFFSET = [50, -50, 0, 100, -100]
+AREA_CENTRES = [(51.57, -0.10), (51.53, -0.03), (51.45, -0.10), (51.51, -0.22), (51.51, -0.12)]
+
+COMPOSITIONS = [
+    '1 adult', '2 adults', '1 adult, 1 child', '1 adult, 2 children',
+    '2 adults, 2 children', '1 adult, 3 children', '2 adults, 4 children'
+]
+COMPOSITION_WEIGHTS = [0.25, 0.12, 0.2, 0.18, 0.13, 0.08, 0.04]
+COMPOSITION_SIZES = [1, 2, 2, 3, 4, 4, 6]
+
+HOUSEHOLD_CHOICES = {
+    'eligibility_pre_screen': (['Yes', 'No'], [0.95, 0.05]),
+    'priority_need': (['Low', 'Medium', 'High', 'Critical'], [0.2, 0.35, 0.3, 0.15]),
+    'intentional_homeless': (['No', 'Yes'], [0.95, 0.05]),
+    'eligibility': (['Eligible', 'Under Review', 'Not Eligible'], [0.85, 0.1, 0.05]),
+    'access_needs': (
+        ['None', 'Wheelchair access', 'Ground floor only', 'Lift required'], [0.7, 0.08, 0.14, 0.08]
+    ),
+    'schools': (
+        ['Not required', 'Primary school required', 'Secondary school required',
+         'Primary and secondary required'], [0.4, 0.3, 0.2, 0.1]
+    ),
+    'employment': (
+        ['Full-time employed', 'Part-time employed', 'Self-employed', 'Unemployed', 'Student'],
+        [0.25, 0.25, 0.1, 0.35, 0.05]
+    ),
+    'health_social_network': (
+        ['Local GP registered', 'Mental health support needed', 'Strong local network',
+         'Hospital nearby needed', 'Substance abuse support', 'Disability support services',
+         'Domestic violence support'], [0.3, 0.2, 0.15, 0.1, 0.08, 0.09, 0.08]
+    ),
+    'caring_responsibilities': (
+        ['No', 'Yes - young children', 'Yes - elderly parent', 'Yes - disabled child', 'Yes - infant'],
+        [0.5, 0.25, 0.1, 0.07, 0.08]
+    ),
+    'risk_level': (['Low', 'Medium', 'High'], [0.6, 0.3, 0.1]),
+    'drug_use': (['No', 'Yes - in recovery', 'Yes - active support needed'], [0.88, 0.08, 0.04]),
+}
+
+PROPERTY_CHOICES = {
+    'neighbour_quality': (['Excellent', 'Good', 'Fair', 'Poor'], [0.2, 0.4, 0.3, 0.1]),
+    'tenure_length': (['long', 'short'], [0.65, 0.35]),
+    'access_features': (
+        ['None', 'Ground floor', 'Lift', 'Wheelchair accessible, Lift',
+         'Wheelchair accessible, Ground floor', 'Ground floor, Security entry',
+         'Lift, Wide doorways', 'Lift, Parking'],
+        [0.4, 0.2, 0.12, 0.06, 0.06, 0.06, 0.05, 0.05]
+    ),
+    'nearby_amenities': (
+        ['Primary school, GP surgery', 'Secondary school, Mental health clinic',
+         'Transport links, Shopping', 'Primary school, Secondary school, Hospital',
+         'Substance abuse clinic, Job centre', 'Primary school, Disability services',
+         "Women's refuge nearby, Childcare", 'Transport, Shopping, Parks', 'GP surgery, Pharmacy',
+         'Primary school, Secondary school', 'Job centre, Transport', 'Substance abuse services',
+         'Schools, Parks, Healthcare', 'Hospital, Schools', 'Transport, GP'],
+        None
+    ),
+}
+
+BED_COUNTS = [1, 2, 3, 4, 5]
+BED_WEIGHTS = [0.32, 0.35, 0.2, 0.1, 0.03]
+
+def _choose(rng, choices, n):
+    """Draw n values from a (values, probabilities) pool."""
+    values, weights = choices
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=n, p=weights)]
+
+def _ids(prefix, start, n, total):
+    """Sequential IDs like HH001, zero-padded to fit total."""
+    width = max(3, len(str(total)))
+    return pd.Series(np.arange(start + 1, start + n + 1)).astype(str).str.zfill(width).radd(prefix).to_numpy()
+
+def synthetic_households(rng, start, n, total):
+    """A chunk of n synthetic households, numbered from start."""
+    composition = rng.choice(len(COMPOSITIONS), size=n, p=COMPOSITION_WEIGHTS)
+    people = np.array(COMPOSITION_SIZES)[composition]
+    columns = {
+        'household_id': _ids('HH', start, n, total),
+        'eligibility_pre_screen': _choose(rng, HOUSEHOLD_CHOICES['eligibility_pre_screen'], n),
+        'area_restrictions': _choose(rng, (AREAS, AREA_WEIGHTS), n),
+        'priority_need': _choose(rng, HOUSEHOLD_CHOICES['priority_need'], n),
+        'intentional_homeless': _choose(rng, HOUSEHOLD_CHOICES['intentional_homeless'], n),
+        'eligibility': _choose(rng, HOUSEHOLD_CHOICES['eligibility'], n),
+        # Most households move on within weeks; a long tail overstays the 42-day limit
+        'length_of_placement': np.minimum(rng.gamma(2.0, 12.0, n).astype(np.int64), 180),
+    }
+    for name in ['access_needs', 'schools', 'employment', 'health_social_network']:
+        columns[name] = _choose(rng, HOUSEHOLD_CHOICES[name], n)
+    # Budget grows with household size; rounded to £50
+    budget = 350 + 110 * people + rng.normal(0, 120, n)
+    columns['affordability'] = (np.maximum(budget, 300) / 50).round().astype(np.int64) * 50
+    columns['caring_responsibilities'] = _choose(rng, HOUSEHOLD_CHOICES['caring_responsibilities'], n)
+    columns['household_composition'] = np.asarray(COMPOSITIONS, dtype=object)[composition]
+    for name in ['risk_level', 'drug_use']:
+        columns[name] = _choose(rng, HOUSEHOLD_CHOICES[name], n)
+    return pd.DataFrame(columns)
+
+def synthetic_properties(rng, start, n, total):
+    """A chunk of n synthetic properties, numbered from start."""
+    area = rng.choice(len(AREAS), size=n, p=AREA_WEIGHTS)
+    beds = rng.choice(BED_COUNTS, size=n, p=BED_WEIGHTS)
+    # Rent rises with size and varies by area; rounded to £10
+    rent = 300 + 150 * beds + np.array(AREA_RENT_OFFSET)[area] + rng.normal(0, 90, n)
+    centres = np.array(AREA_CENTRES)[area]
+    return pd.DataFrame({
+        'property_id': _ids('PROP', start, n, total),
+        'location': np.asarray(AREAS, dtype=object)[area],
+        'neighbour_quality': _choose(rng, PROPERTY_CHOICES['neighbour_quality'], n),
+        'affordability': (np.maximum(rent, 300) / 10).round().astype(np.int64) * 10,
+        'rooms': beds + rng.choice([0, 1, 1, 1, 2], size=n),
+        'beds': beds,
+        'tenure_length': _choose(rng, PROPERTY_CHOICES['tenure_length'], n),
+        'access_features': _choose(rng, PROPERTY_CHOICES['access_features'], n),
+        'nearby_amenities': _choose(rng, PROPERTY_CHOICES['nearby_amenities'], n),
+        'latitude': (centres[:, 0] + rng.normal(0, 0.02, n)).round(5),
+        'longitude': (centres[:, 1] + rng.normal(0, 0.03, n)).round(5),
+    })
+
+def write_synthetic(make_chunk, total, path, rng, chunk_size=100_000, fmt='csv'):
+    """
+    Generate total rows chunk by chunk and append them to path.
+    
+    Args:
+        make_chunk: synthetic_households or synthetic_properties
+        total: Number of rows to write
+        path: Output file
+        rng: numpy Generator the rows are drawn from
+        chunk_size: Rows generated and written at a time
+        fmt: 'csv', 'parquet' or 'arrow' (Arrow IPC, as read by columnar_data)
+    """
+    writer = None
+    try:
+        for start in range(0, total, chunk_size):
+            chunk = make_chunk(rng, start, min(chunk_size, total - start), total)
+            if fmt == 'csv':
+                chunk.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+                continue
+            import pyarrow as pa
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                if fmt == 'parquet':
+                    import pyarrow.parquet
+                    writer = pa.parquet.ParquetWriter(str(path), table.schema)
+                else:
+                    import pyarrow.ipc
+                    writer = pa.ipc.new_file(str(path), table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def save_synthetic(households, properties, seed=None, fmt='csv', chunk_size=100_000, data_dir='data'):
+    """
+    Write synthetic household and property tables of the given sizes.
+
+    Each table has its own random stream spawned from the seed, so the
+    properties do not change with the number of households. Rows are drawn
+    chunk by chunk, so the data also depends on chunk_size.
+    """
+    data_dir = Path(data_dir)
+    data_dir.mkdir(exist_ok=True)
+    suffix = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}[fmt]
+    household_seed, property_seed = np.random.SeedSequence(seed).spawn(2)
+    for name, make_chunk, total, table_seed in [
+        ('household_data', synthetic_households, households, household_seed),
+        ('property_data', synthetic_properties, properties, property_seed),
+    ]:
+        if total is None:
+            continue
+        path = data_dir / f'{name}{suffix}'
+        write_synthetic(make_chunk, total, path, np.random.default_rng(table_seed), chunk_size, fmt)
+        print(f"✓ Created {path} with {total} rows")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--households', type=int, help="Number of synthetic households")
+    parser.add_argument('--properties', type=int, help="Number of synthetic properties")
+    parser.add_argument('--seed', type=int,
+                        help="Random seed; the same seed and --chunk-size give the same data "
+                             "(a different chunk size draws different rows)")
+    parser.add_argument('--format', choices=['csv', 'parquet', 'arrow'], default='csv',
+                        help="Output format (parquet and arrow need pyarrow)")
+    parser.add_argument('--chunk-size', type=int, default=100_000,
+                        help="Rows generated per chunk; part of what --seed reproduces")
+    parser.add_argument('--output-dir', default='data', help="Directory to write to")
+    return parser.parse_args(argv)
+
 if __name__ == '__main__':
-    save_to_csv()
+    args = parse_args()
+    if args.households is None and args.properties is None:
+        save_to_csv()
+    else:
+        save_synthetic(args.households, args.properties, args.seed, args.format,
+                       args.chunk_size, args.output_dir)
     print("\n✓ Data generation complete!")
@@ -0,0 +1,73 @@
+"""
+Live-update helpers shared by the property indexes.
+
+The indexes keep per-position columns that grow as properties are added
+(grow doubles them, so appends cost amortised O(1)). Instead of updating
+their sorted structures on every change, they hold new entries in a
+pending list and skip withdrawn ones, and re-sort or rebuild once those
+outgrow a fraction of what is indexed (needs_rebuild).
+"""
+import numpy as np
+from typing import List
+
+# Pending plus stale entries tolerated before a rebuild: a floor plus a
+# fraction of the indexed entries
+REBUILD_FLOOR = 64
+REBUILD_FRACTION = 8
+
+
+def grow(column: np.ndarray, position: int, fill=0) -> np.ndarray:
+    """
+    A column long enough to hold position.
+
+    Returns column itself when it already is, otherwise a copy at least
+    twice as long whose new rows (along the first axis) hold fill.
+    """
+    size = len(column)
+    if position < size:
+        return column
+    grown = np.full((max(position + 1, 2 * size, 16),) + column.shape[1:], fill, dtype=column.dtype)
+    grown[:size] = column
+    return grown
+
+
+def needs_rebuild(waiting: int, indexed: int) -> bool:
+    """True once waiting (pending or stale) entries outgrow the indexed ones."""
+    return waiting > REBUILD_FLOOR + indexed // REBUILD_FRACTION
+
+
+class DeferredRebuild:
+    """
+    Pending and stale bookkeeping for an index rebuilt in bulk.
+
+    Subclasses keep boolean _live and _in_tree masks by position and a
+    _build method that rebuilds over the live positions and calls
+    _reset_pending. Queries search the built structure, drop entries no
+    longer _in_tree, and check _pending_positions directly.
+    """
+
+    def _reset_pending(self):
+        """Forget pending and stale entries (after a rebuild)."""
+        self._pending: List[int] = []
+        self._stale = 0
+
+    def _queue(self, position: int, indexed: int):
+        """Make position live and pending; rebuild if too much is waiting."""
+        self._live[position] = True
+        self._pending.append(position)
+        if needs_rebuild(len(self._pending) + self._stale, indexed):
+            self._build()
+
+    def remove(self, position: int):
+        """Drop the property at position from future results."""
+        if position >= len(self._live):
+            return
+        self._live[position] = False
+        if self._in_tree[position]:
+            self._in_tree[position] = False
+            self._stale += 1
+
+    def _pending_positions(self) -> np.ndarray:
+        """Live positions waiting for the next rebuild."""
+        positions = np.unique(np.array(self._pending, dtype=np.intp))
+        return positions[self._live[positions]]
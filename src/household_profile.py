@@ -0,0 +1,146 @@
+"""
+Compiled household requirements for the matching engine.
+
+A household arrives as a dict of free-text form fields. Scoring needs only a
+handful of values derived from them (beds required, budget, area, access
+requirement and which amenity checks apply), so the text is parsed once into
+a HouseholdProfile and reused for every property scored.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+# Amenity checks applied by score_amenities, in evaluation order:
+# (household field, household keywords, property amenity keywords, credit)
+AMENITY_CHECKS = [
+    ('schools', ('primary',), ('primary',), 1.0),
+    ('schools', ('secondary',), ('secondary',), 1.0),
+    ('health_social_network', ('mental health', 'support'), ('mental health', 'clinic'), 1.0),
+    ('health_social_network', ('hospital', 'disability'), ('hospital', 'disability'), 1.0),
+    ('health_social_network', ('substance', 'drug'), ('substance', 'clinic'), 1.0),
+    ('employment', ('unemployed',), ('job centre',), 0.5),
+]
+
+# Access requirement classes, as distinguished by score_access_needs
+ACCESS_REQUIREMENTS = ['none', 'wheelchair', 'ground floor', 'lift', 'other']
+
+# Optional household fields holding an anchor point as "latitude, longitude"
+ANCHOR_FIELDS = ['school_location', 'workplace_location', 'support_network_location']
+
+
+@lru_cache(maxsize=4096)
+def _bedroom_requirement(comp_lower: str) -> int:
+    """Memoized body of bedroom_requirement, keyed on the lower-cased text."""
+    # Extract number of children
+    if 'child' in comp_lower:
+        parts = comp_lower.split(',')
+        for part in parts:
+            if 'child' in part:
+                num_children = int(''.join(filter(str.isdigit, part.split()[0])))
+                # Simplified: 1 bed per 2 children + 1 for adults
+                return 1 + (num_children + 1) // 2
+
+    # Adults only
+    return 1
+
+
+def bedroom_requirement(household_comp: str) -> int:
+    """
+    Minimum bedrooms for a household composition such as "2 adults, 2 children".
+
+    The same few compositions repeat across a caseload, so results are cached.
+    """
+    return _bedroom_requirement(str(household_comp).lower())
+
+
+def access_requirement(household_needs: str) -> str:
+    """
+    Classify access needs the same way score_access_needs does.
+    Returns one of ACCESS_REQUIREMENTS.
+    """
+    needs_lower = str(household_needs).lower()
+
+    if 'none' in needs_lower or not str(household_needs).strip():
+        return 'none'
+    for requirement in ('wheelchair', 'ground floor', 'lift'):
+        if requirement in needs_lower:
+            return requirement
+    return 'other'
+
+
+def amenity_needs(household: Dict) -> int:
+    """Bitmask with bit i set when AMENITY_CHECKS[i] applies to the household."""
+    needs = 0
+    for i, (field, keywords, _, _) in enumerate(AMENITY_CHECKS):
+        text = str(household.get(field, '')).lower()
+        if any(keyword in text for keyword in keywords):
+            needs |= 1 << i
+    return needs
+
+
+def parse_point(value) -> Optional[Tuple[float, float]]:
+    """(latitude, longitude) from a "lat, lon" string or a pair; None if missing or invalid."""
+    if isinstance(value, str):
+        value = value.split(',')
+    try:
+        latitude, longitude = (float(v) for v in value)
+    except (TypeError, ValueError):
+        return None
+    if latitude != latitude or longitude != longitude:
+        return None
+    return latitude, longitude
+
+
+def anchor_points(household: Dict) -> Tuple[Tuple[float, float], ...]:
+    """The household's anchor points (school, workplace, support network) that are given."""
+    points = (parse_point(household.get(field)) for field in ANCHOR_FIELDS)
+    return tuple(point for point in points if point is not None)
+
+
+@dataclass(frozen=True)
+class HouseholdProfile:
+    """Scoring-relevant requirements of one household, parsed once."""
+    household_id: Optional[Any]
+    required_beds: int
+    budget: float
+    area: str
+    access_requirement: str
+    amenity_needs: int
+    length_of_placement: int = 0
+    priority_need: str = ''
+    stated_budget: Any = None
+    anchors: Tuple[Tuple[float, float], ...] = ()
+
+    @classmethod
+    def from_household(cls, household: Dict) -> 'HouseholdProfile':
+        """Compile a household dict (intake form fields) into a profile."""
+        return cls(
+            household_id=household.get('household_id'),
+            required_beds=bedroom_requirement(
+                household.get('household_composition', '1 adult')
+            ),
+            budget=float(household.get('affordability', 0)),
+            area=str(household.get('area_restrictions', '')).lower().strip(),
+            access_requirement=access_requirement(household.get('access_needs', '')),
+            amenity_needs=amenity_needs(household),
+            length_of_placement=int(household.get('length_of_placement', 0)),
+            priority_need=str(household.get('priority_need', '')),
+            stated_budget=household.get('affordability'),
+            anchors=anchor_points(household)
+        )
+
+    def scoring_key(self) -> tuple:
+        """The fields that determine component scores, for caching them."""
+        return (self.required_beds, self.budget, self.area, self.access_requirement,
+                self.amenity_needs, self.anchors)
+
+    def needs_check(self, check: int) -> bool:
+        """True when AMENITY_CHECKS[check] applies to this household."""
+        return bool(self.amenity_needs >> check & 1)
+
+
+def compile_household(household) -> HouseholdProfile:
+    """Return household as a HouseholdProfile, compiling it if it is a dict."""
+    if isinstance(household, HouseholdProfile):
+        return household
+    return HouseholdProfile.from_household(household)
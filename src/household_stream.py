@@ -0,0 +1,95 @@
+"""
+Streaming ingestion of household caseload files.
+
+A full caseload export holds years of closed cases and can be far larger
+than memory. These readers go through the CSV in fixed-size chunks
+(pd.read_csv with chunksize), drop closed and ineligible cases from each
+chunk as it is read, and re-batch the remaining households into chunks of
+exactly chunk_size (the last may be shorter). Only a couple of chunks are
+in memory at any time, whatever the size of the file.
+
+A case is kept when:
+- its case_status, if the file has that column, is not 'Closed'
+- eligibility is 'Eligible'
+- eligibility_pre_screen is not 'No'
+- intentional_homeless is not 'Yes'
+"""
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from columnar_data import HOUSEHOLD_COLUMNS, HOUSEHOLD_DTYPES, HOUSEHOLD_NA_OPTIONS
+from household_profile import HouseholdProfile, compile_household
+
+# Optional column recording whether a case is still open
+CASE_STATUS_FIELD = 'case_status'
+CLOSED_STATUSES = {'closed'}
+
+
+def _text(chunk: pd.DataFrame, name: str) -> pd.Series:
+    """Lower-case, stripped text of a column ('' where missing or absent)."""
+    if name not in chunk.columns:
+        return pd.Series('', index=chunk.index)
+    return chunk[name].fillna('').astype(str).str.strip().str.lower()
+
+
+def open_eligible(chunk: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of the open, eligible cases in a chunk of households."""
+    keep = ~_text(chunk, CASE_STATUS_FIELD).isin(CLOSED_STATUSES)
+    if 'eligibility' in chunk.columns:
+        keep &= _text(chunk, 'eligibility') == 'eligible'
+    keep &= _text(chunk, 'eligibility_pre_screen') != 'no'
+    keep &= ~_text(chunk, 'intentional_homeless').str.startswith('yes')
+    return keep.to_numpy()
+
+
+def iter_households(path: Union[str, Path], chunk_size: int = 1000,
+                    open_only: bool = True) -> Iterator[List[Dict]]:
+    """
+    Yield household records from a caseload CSV in chunks of chunk_size.
+
+    Args:
+        path: Caseload CSV (same columns as household_data.csv)
+        chunk_size: Households per yielded chunk
+        open_only: Drop closed and ineligible cases (see open_eligible)
+    """
+    wanted = set(HOUSEHOLD_COLUMNS) | {CASE_STATUS_FIELD}
+    reader = pd.read_csv(
+        path, dtype=HOUSEHOLD_DTYPES, usecols=lambda name: name in wanted, chunksize=chunk_size,
+        **HOUSEHOLD_NA_OPTIONS
+    )
+    pending: List[Dict] = []
+    with reader:
+        for chunk in reader:
+            if open_only:
+                chunk = chunk[open_eligible(chunk)]
+            pending.extend(chunk.to_dict('records'))
+            while len(pending) >= chunk_size:
+                yield pending[:chunk_size]
+                pending = pending[chunk_size:]
+    if pending:
+        yield pending
+
+
+def iter_profiles(path: Union[str, Path], chunk_size: int = 1000,
+                  open_only: bool = True) -> Iterator[List[HouseholdProfile]]:
+    """Like iter_households, but yield compiled HouseholdProfiles."""
+    for households in iter_households(path, chunk_size, open_only):
+        yield [compile_household(h) for h in households]
+
+
+def stream_matches(matcher, path: Union[str, Path], chunk_size: int = 256,
+                   weights: Optional[Dict[str, float]] = None, open_only: bool = True):
+    """
+    Score a caseload file against the matcher's properties, chunk by chunk.
+
+    Yields one CohortScores per chunk_size households (see
+    AccommodationMatcher.iter_match_many), so peak memory is bounded by
+    the chunk size rather than the size of the file.
+    """
+    households = (
+        household for chunk in iter_households(path, chunk_size, open_only) for household in chunk
+    )
+    return matcher.iter_match_many(households, chunk_size, weights)
@@ -0,0 +1,153 @@
+"""
+Cache of ranked match results.
+
+Caseworkers often resubmit the same intake form, and re-scoring every
+property for an unchanged household gives the same ranking. MatchCache keeps
+recent rankings in an LRU bounded by size and age.
+
+Entries are keyed on a canonical hash of the scoring-relevant household
+fields (the compiled HouseholdProfile, less the household ID and priority
+need, which do not affect results), the weights in use and the matcher's
+data_version. Any
+property change gives the data a new version, so stale rankings are never
+returned and are dropped the next time the cache is used.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, Optional, Union
+
+from household_profile import HouseholdProfile, compile_household
+from match_results import RankedMatches
+
+# Profile fields that do not change the ranking or its rendered results
+_IGNORED_FIELDS = ('household_id', 'priority_need')
+
+
+def profile_key(household: Union[Dict, HouseholdProfile]) -> str:
+    """Canonical hash of the fields of a household that affect its ranking."""
+    profile = compile_household(household)
+    values = tuple(
+        (f.name, getattr(profile, f.name)) for f in fields(profile)
+        if f.name not in _IGNORED_FIELDS
+    )
+    return hashlib.blake2b(repr(values).encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    """Counters reported by MatchCache.stats()."""
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MatchCache:
+    """LRU cache of match_household rankings, bounded by size and TTL."""
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = 900.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            maxsize: Most rankings kept; the least recently used is evicted
+            ttl: Seconds an entry stays valid (None keeps entries until evicted)
+            clock: Time source, in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._data_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+        self._expirations = self._invalidations = 0
+
+    def match(self, matcher, household: Union[Dict, HouseholdProfile],
+              top_k: Optional[int] = None, feasible_only: bool = False,
+              weights: Optional[Dict[str, float]] = None) -> RankedMatches:
+        """
+        matcher.match_household(household, top_k, feasible_only, weights),
+        from the cache when the same household was ranked against the same
+        data with the same weights.
+        """
+        profile = compile_household(household)
+        data_version = matcher.data_version
+        key = (
+            profile_key(profile), data_version, top_k, feasible_only,
+            tuple(matcher.weight_vector(weights).tolist())
+        )
+
+        with self._lock:
+            self._check_version(data_version)
+            results = self._get(key)
+        if results is not None:
+            return results
+
+        results = matcher.match_household(
+            profile, top_k=top_k, feasible_only=feasible_only, weights=weights
+        )
+        with self._lock:
+            self._check_version(data_version)
+            self._put(key, results)
+        return results
+
+    def _check_version(self, data_version: str):
+        """Drop every entry when the property data has changed."""
+        if data_version != self._data_version:
+            if self._entries:
+                self._invalidations += 1
+                self._entries.clear()
+            self._data_version = data_version
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        expires, results = entry
+        if expires is not None and self._clock() >= expires:
+            del self._entries[key]
+            self._expirations += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return results
+
+    def _put(self, key, results: RankedMatches):
+        expires = None if self.ttl is None else self._clock() + self.ttl
+        self._entries[key] = (expires, results)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def clear(self):
+        """Remove every entry; statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """Hit, miss and eviction counts since the cache was created."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+                size=len(self._entries)
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,311 @@
+"""
+Match result records with lazily rendered explanations.
+
+Callers usually display only the top few matches, so the human-readable
+suitability flags and explanation are not built when a property is scored.
+Each result carries its component scores and a compact reason code (a
+bitfield of the flag conditions) and renders the strings on first access.
+
+A ranking is returned as RankedMatches: parallel arrays of property
+positions, overall scores, component scores and reason codes. Rows are
+built as MatchResult objects only when they are read.
+"""
+import copy
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Reason code bits, in the order the suitability flags are listed
+UNAFFORDABLE = 1 << 0
+ACCESS_NOT_MET = 1 << 1
+INSUFFICIENT_BEDROOMS = 1 << 2
+WRONG_LOCATION = 1 << 3
+LIMIT_REACHED = 1 << 4
+LIMIT_APPROACHING = 1 << 5
+OUT_OF_REACH = 1 << 6
+
+# Families should not stay in emergency accommodation beyond this many days
+EMERGENCY_LIMIT_DAYS = 42
+# Days in emergency accommodation from which a match warns of the limit
+LIMIT_WARNING_DAYS = 35
+
+FLAG_MESSAGES = [
+    (UNAFFORDABLE, '⚠️ UNAFFORDABLE - Exceeds budget'),
+    (ACCESS_NOT_MET, '⚠️ ACCESS NEEDS NOT MET - Critical requirement'),
+    (INSUFFICIENT_BEDROOMS, '⚠️ INSUFFICIENT BEDROOMS - Below standard'),
+    (WRONG_LOCATION, '⚠️ WRONG LOCATION - Area restriction not met'),
+    (OUT_OF_REACH, "⚠️ OUT OF REACH - Too far from household's anchor points"),
+    (LIMIT_REACHED, f'🚨 URGENT - {EMERGENCY_LIMIT_DAYS}-day emergency limit reached/exceeded'),
+    (LIMIT_APPROACHING, f'⚠️ WARNING - Approaching {EMERGENCY_LIMIT_DAYS}-day emergency limit'),
+]
+
+# Property fields copied into every result, in display order
+PROPERTY_FIELDS = [
+    'property_id', 'location', 'rooms', 'beds', 'affordability', 'tenure_length',
+    'neighbour_quality', 'access_features', 'nearby_amenities'
+]
+
+# Keys rendered on first access
+LAZY_FIELDS = ('suitability_flags', 'match_explanation')
+
+# component_scores keys, in AccommodationMatcher.COMPONENTS order
+COMPONENT_KEYS = ['location', 'bedrooms', 'affordability', 'access', 'amenities']
+
+# Reason code bit set when a component scores 0
+_ZERO_SCORE_BITS = {
+    'affordability': UNAFFORDABLE,
+    'access': ACCESS_NOT_MET,
+    'bedrooms': INSUFFICIENT_BEDROOMS,
+    'location': WRONG_LOCATION,
+}
+
+
+def reason_code(component_scores: Dict[str, float], days_in_emergency: int,
+                by_distance: bool = False) -> int:
+    """
+    Bitfield of the suitability flags that apply to one match.
+
+    by_distance: the location was scored by distance to the household's
+    anchor points, so a zero score means out of reach, not the wrong area.
+    """
+    code = 0
+    if component_scores['affordability'] == 0.0:
+        code |= UNAFFORDABLE
+    if component_scores['access'] == 0.0:
+        code |= ACCESS_NOT_MET
+    if component_scores['bedrooms'] == 0.0:
+        code |= INSUFFICIENT_BEDROOMS
+    if component_scores['location'] == 0.0:
+        code |= OUT_OF_REACH if by_distance else WRONG_LOCATION
+
+    # Check 42-day emergency accommodation limit
+    if days_in_emergency >= EMERGENCY_LIMIT_DAYS:
+        code |= LIMIT_REACHED
+    elif days_in_emergency >= LIMIT_WARNING_DAYS:
+        code |= LIMIT_APPROACHING
+    return code
+
+
+def reason_codes(components: np.ndarray, days_in_emergency: int,
+                 by_distance: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Vectorized reason_code for a matrix of component scores (columns in COMPONENT_KEYS order).
+
+    by_distance optionally marks the rows whose location was scored by distance.
+    """
+    codes = np.zeros(len(components), dtype=np.uint8)
+    for key, bit in _ZERO_SCORE_BITS.items():
+        codes[components[:, COMPONENT_KEYS.index(key)] == 0.0] |= bit
+    if by_distance is not None:
+        out_of_reach = by_distance & (codes & WRONG_LOCATION != 0)
+        codes[out_of_reach] ^= WRONG_LOCATION | OUT_OF_REACH
+    return codes | reason_code(dict.fromkeys(COMPONENT_KEYS, 1.0), days_in_emergency)
+
+
+def render_flags(code: int) -> List[str]:
+    """Suitability flag messages for a reason code."""
+    return [message for bit, message in FLAG_MESSAGES if code & bit]
+
+
+def render_explanation(loc_score, bed_score, afford_score, access_score,
+                       prop, household_budget, req_beds, out_of_reach=False) -> str:
+    """Generate human-readable explanation of match quality."""
+    explanations = []
+
+    if out_of_reach:
+        explanations.append(f"✗ Too far from household's anchor points (property in {prop['location']})")
+    elif loc_score == 1.0:
+        explanations.append(f"✓ Location matches preferred area ({prop['location']})")
+    elif loc_score > 0.0:
+        explanations.append(f"~ Within reach of household's anchor points (property in {prop['location']})")
+    else:
+        explanations.append(f"✗ Location mismatch (property in {prop['location']})")
+
+    if bed_score == 1.0:
+        explanations.append(f"✓ Suitable bedroom count ({prop['beds']} beds for {req_beds} required)")
+    elif bed_score == 0.0:
+        explanations.append(f"✗ Insufficient bedrooms ({prop['beds']} available, {req_beds} required)")
+    else:
+        explanations.append(f"~ Over-provision ({prop['beds']} beds for {req_beds} required)")
+
+    if afford_score == 1.0:
+        explanations.append(f"✓ Within budget (£{prop['affordability']}/month)")
+    elif afford_score == 0.0:
+        explanations.append(f"✗ Over budget (£{prop['affordability']} vs £{household_budget} budget)")
+    else:
+        explanations.append(f"~ Well under budget (£{prop['affordability']}/month)")
+
+    if access_score == 1.0:
+        explanations.append("✓ Access needs met")
+    elif access_score == 0.0:
+        explanations.append("✗ Critical access needs NOT met")
+    else:
+        explanations.append("~ Partial access needs match")
+
+    return " | ".join(explanations)
+
+
+class MatchResult(Mapping):
+    """
+    One ranked match, readable like the original result dict.
+
+    Property fields, overall_score and component_scores are stored directly.
+    suitability_flags and match_explanation are rendered from the reason code
+    and component scores the first time they are read.
+    """
+
+    def __init__(self, prop: Dict[str, Any], overall_score: float,
+                 component_scores: Dict[str, float], reason_code: int,
+                 required_beds: int, household_budget: Any):
+        self._values = {field: prop[field] for field in PROPERTY_FIELDS}
+        self._values['overall_score'] = overall_score
+        self._values['component_scores'] = component_scores
+        self.reason_code = reason_code
+        self.required_beds = required_beds
+        self.household_budget = household_budget
+
+    @property
+    def suitability_flags(self) -> List[str]:
+        """Warnings and issues for this match, rendered on first access."""
+        if 'suitability_flags' not in self._values:
+            self._values['suitability_flags'] = render_flags(self.reason_code)
+        return self._values['suitability_flags']
+
+    @property
+    def match_explanation(self) -> str:
+        """Human-readable explanation, rendered on first access."""
+        if 'match_explanation' not in self._values:
+            scores = self._values['component_scores']
+            self._values['match_explanation'] = render_explanation(
+                scores['location'], scores['bedrooms'], scores['affordability'],
+                scores['access'], self._values, self.household_budget, self.required_beds,
+                bool(self.reason_code & OUT_OF_REACH)
+            )
+        return self._values['match_explanation']
+
+    def __getitem__(self, key):
+        if key in LAZY_FIELDS:
+            return getattr(self, key)
+        return self._values[key]
+
+    def __contains__(self, key):
+        return key in self._values or key in LAZY_FIELDS
+
+    def __iter__(self):
+        yield from PROPERTY_FIELDS
+        yield 'overall_score'
+        yield 'component_scores'
+        yield from LAZY_FIELDS
+
+    def __len__(self):
+        return len(PROPERTY_FIELDS) + 2 + len(LAZY_FIELDS)
+
+    def __repr__(self):
+        return (f"MatchResult({self._values['property_id']!r}, "
+                f"overall_score={self._values['overall_score']:.3f})")
+
+
+class RankedMatches(Sequence):
+    """
+    A household's ranked matches, held as parallel arrays.
+
+    Indexing with an integer returns the MatchResult for that rank, so a
+    RankedMatches reads like the list of result dicts match_household used
+    to return; slicing returns another RankedMatches. The ranked properties
+    are copied out of the store (see PropertyStore.take) when the ranking is
+    made, so later updates or withdrawals do not change results already held.
+    """
+
+    def __init__(self, store, positions: np.ndarray, scores: np.ndarray,
+                 components: np.ndarray, flags: np.ndarray,
+                 required_beds: int, household_budget: Any):
+        """
+        Args:
+            store: PropertyStore the positions refer to
+            positions: Property position of each match, best first
+            scores: Overall score of each match
+            components: Component scores, one row per match, columns in
+                COMPONENT_KEYS order
+            flags: Reason code of each match (see reason_codes)
+            required_beds: Beds the household needs, for explanations
+            household_budget: Budget as stated by the household, for explanations
+        """
+        self._rows = store.take(positions)
+        self.positions = positions
+        self.scores = scores
+        self.components = components
+        self.flags = flags
+        self.required_beds = required_beds
+        self.household_budget = household_budget
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self._take(key)
+        i = range(len(self))[key]
+        return MatchResult(
+            self._rows.record(i),
+            float(self.scores[i]),
+            dict(zip(COMPONENT_KEYS, (float(score) for score in self.components[i]))),
+            int(self.flags[i]),
+            self.required_beds,
+            self.household_budget
+        )
+
+    def _take(self, rows) -> 'RankedMatches':
+        """Matches at the given rows (a slice or index array)."""
+        taken = copy.copy(self)
+        taken._rows = self._rows.take(np.arange(len(self))[rows])
+        taken.positions = self.positions[rows]
+        taken.scores = self.scores[rows]
+        taken.components = self.components[rows]
+        taken.flags = self.flags[rows]
+        return taken
+
+    @property
+    def property_ids(self) -> List[str]:
+        """Property IDs in rank order."""
+        return [str(pid) for pid in self._rows.property_ids]
+
+    def arrays(self) -> Dict[str, Any]:
+        """
+        Constructor arguments other than the store.
+
+        RankedMatches(store, **matches.arrays()) rebuilds the ranking over
+        another copy of the same store, e.g. after crossing a process boundary.
+        """
+        return {
+            'positions': self.positions,
+            'scores': self.scores,
+            'components': self.components,
+            'flags': self.flags,
+            'required_beds': self.required_beds,
+            'household_budget': self.household_budget,
+        }
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Every match as a plain dict with flags and explanation rendered."""
+        return [dict(result) for result in self]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """One row per match in rank order, with a column per component score."""
+        frame = self._rows.to_dataframe(np.arange(len(self)))[PROPERTY_FIELDS].reset_index(drop=True)
+        frame['overall_score'] = self.scores
+        for i, key in enumerate(COMPONENT_KEYS):
+            frame[f'{key}_score'] = self.components[:, i]
+        frame['reason_code'] = self.flags
+        return frame
+
+    def __eq__(self, other):
+        if not isinstance(other, (RankedMatches, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"RankedMatches({len(self)} matches)"
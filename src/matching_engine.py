@@ -14,9 +14,89 @@ Justification for weighted scoring over ML:
 - Small dataset size makes ML less reliable
 - Easier to audit and adjust weights based on policy changes
 """
+import heapq
+import itertools
+import uuid
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from candidate_index import CandidateIndex
+from match_results import (
+    EMERGENCY_LIMIT_DAYS, MatchResult, RankedMatches, reason_codes
+)
+from household_profile import (
+    ACCESS_REQUIREMENTS, AMENITY_CHECKS, HouseholdProfile, bedroom_requirement,
+    compile_household
+)
+from feature_encoding import (
+    ACCESS_FEATURES, AMENITY_FEATURES, feature_mask, has_any
+)
+from growable import grow
+from property_store import PropertyStore, as_rent
+from spatial_index import SpatialIndex, haversine_km
+from amenity_index import AMENITY_RADIUS_KM, AmenityIndex
+from availability_index import OPEN_END, OPEN_START, AvailabilityIndex, day_number, to_days
+
+# Properties scored per block by iter_matches
+_SCORE_BLOCK = 65536
+
+# Households whose component scores a matcher keeps for re-weighting
+_COMPONENT_CACHE_SIZE = 16
+
+# Slack on score upper bounds, far above floating-point rounding
+_BOUND_TOLERANCE = 1e-9
+
+# Default distance at which the 'distance' location score reaches 0
+DISTANCE_RADIUS_KM = 10.0
+
+def rank_scores(scores: np.ndarray, top_k: Optional[int] = None) -> np.ndarray:
+    """
+    Positions of the best scores in descending order.
+    
+    Ties keep their original order, so the first k positions are always the
+    same as those of a full stable sort. With top_k the selection uses
+    np.partition (linear time) and only the k winners are sorted.
+    """
+    n = len(scores)
+    if top_k is None or top_k >= n:
+        return np.argsort(-scores, kind='stable')
+    if top_k <= 0:
+        return np.array([], dtype=np.intp)
+    
+    # Value of the k-th best score, then everything strictly better plus the
+    # earliest positions tied with it
+    threshold = -np.partition(-scores, top_k - 1)[top_k - 1]
+    better = np.flatnonzero(scores > threshold)
+    tied = np.flatnonzero(scores == threshold)[:top_k - len(better)]
+    winners = np.concatenate([better, tied])
+    return winners[np.lexsort((winners, -scores[winners]))]
+
+
+@dataclass
+class CohortScores:
+    """
+    Scores for a cohort of households against every property.
+    
+    Row i of each matrix belongs to household_ids[i] and column j to
+    property_ids[j]. components maps each name in
+    AccommodationMatcher.COMPONENTS to its households x properties matrix.
+    """
+    household_ids: List
+    property_ids: List[str]
+    scores: np.ndarray
+    components: Dict[str, np.ndarray]
+    
+    def row(self, household_id) -> np.ndarray:
+        """Overall scores of one household against every property."""
+        return self.scores[self.household_ids.index(household_id)]
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """Overall score matrix labelled by household and property IDs."""
+        return pd.DataFrame(self.scores, index=self.household_ids, columns=self.property_ids)
+
 
 class AccommodationMatcher:
     """Match households to suitable temporary accommodation."""
@@ -30,10 +110,341 @@ class AccommodationMatcher:
         'amenities': 0.05        # Nice-to-have nearby services
     }
     
-    def __init__(self, properties_df: pd.DataFrame):
-        """Initialize matcher with property data."""
-        self.properties = properties_df.copy()
+    # Column order of the component score matrix used by the vectorized scorer
+    COMPONENTS = [
+        'location',
+        'bedroom_suitability',
+        'affordability',
+        'access_needs',
+        'amenities'
+    ]
+    
+    # How the location component is scored:
+    # - 'area': exact match of property location and area_restrictions
+    # - 'distance': distance from the household's anchor points (school,
+    #   workplace, support network), falling back to the area match for
+    #   households without anchors or properties without coordinates
+    LOCATION_MODES = ['area', 'distance']
+    
+    def __init__(self, properties: Union[pd.DataFrame, PropertyStore],
+                 weights: Optional[Dict[str, float]] = None,
+                 location_mode: str = 'area',
+                 distance_radius_km: float = DISTANCE_RADIUS_KM):
+        """
+        Initialize matcher with property data.
+        
+        Args:
+            properties: Property DataFrame (converted to a PropertyStore) or an
+                existing PropertyStore, which is used directly without copying
+            weights: Optional weight per component for this matcher, replacing
+                WEIGHTS (see set_weights)
+            location_mode: One of LOCATION_MODES
+            distance_radius_km: In 'distance' mode, the distance at which the
+                location score falls to 0 (see score_distance)
+        """
+        if location_mode not in self.LOCATION_MODES:
+            raise ValueError(f"location_mode must be one of {self.LOCATION_MODES}")
+        self.location_mode = location_mode
+        self.distance_radius_km = distance_radius_km
+        self._weight_vector = np.array([self.WEIGHTS[c] for c in self.COMPONENTS])
+        if weights is not None:
+            self.set_weights(weights)
+        if isinstance(properties, PropertyStore):
+            self._store = properties
+        else:
+            self._store = PropertyStore.from_dataframe(properties)
+        self._compile_properties()
+    
+    @classmethod
+    def from_repository(cls, repository, household: Union[Dict, HouseholdProfile, None] = None,
+                        same_area: bool = False, **options) -> 'AccommodationMatcher':
+        """
+        Build a matcher over properties fetched from a PropertyRepository.
+        
+        With a household, its hard constraints (beds, budget, wheelchair or
+        ground floor need and, with same_area, its area) are pushed down into
+        SQL so only candidate rows are fetched and scored. The matcher then
+        ranks exactly what feasible_candidates would allow for that household.
+        
+        Args:
+            repository: PropertyRepository holding the stock
+            household: Optional household dict or HouseholdProfile to fetch
+                candidates for; without one the whole stock is loaded
+            same_area: Also require properties in the household's area
+            options: Passed to the constructor (weights, location_mode, ...)
+        """
+        if household is None:
+            return cls(repository.all_properties(), **options)
+        return cls(repository.candidates(household, same_area), **options)
+    
+    def _compile_properties(self):
+        """
+        Build the candidate index over the property store.
+        
+        Each property keeps a fixed position in the store for the life of the
+        matcher. Withdrawn properties leave an inactive slot behind.
+        """
+        store = self._store
+        active = store.active_positions()
+        self._frame = None
+        self._positions_cache = active
+        self._component_cache = OrderedDict()
+        self._spatial = None
+        self._amenities = None
+        self._amenity_bits = None
+        self._amenity_version = None
+        self._availability = None
+        self._index = CandidateIndex(
+            store.location_codes, store.beds, store.rents, store.access_bits[:store.size]
+        )
+        for position in np.flatnonzero(~store.active[:store.size]):
+            self._index.remove(position)
+    
+    @property
+    def store(self) -> PropertyStore:
+        """Columnar property store backing this matcher."""
+        return self._store
+    
+    @property
+    def data_version(self) -> str:
+        """Version stamp of the property data; changes with every property or amenity update."""
+        if self._amenity_version is None:
+            return self._store.data_version
+        return f"{self._store.data_version}-{self._amenity_version}"
+    
+    @property
+    def properties(self) -> pd.DataFrame:
+        """Active properties, indexed by their position in the matcher."""
+        if self._frame is None:
+            self._frame = self._store.to_dataframe(self._active_positions)
+        return self._frame
+    
+    def add_property(self, prop: Dict) -> int:
+        """
+        Add a property to a live matcher without rebuilding it.
+        
+        Store columns grow by doubling and the candidate index takes the new
+        entry in amortised O(1).
+        
+        Returns:
+            Position of the new property
+        """
+        position = self._store.append(prop)
+        self._index_property(position)
+        return position
+    
+    def update_property(self, property_id: str, changes: Dict) -> int:
+        """
+        Change fields of an existing property in place.
+        
+        The property keeps its position, so ties still rank it where it was.
+        
+        Returns:
+            Position of the updated property
+        """
+        position = self._position(property_id)
+        prop = dict(self._store.record(position), **changes)
+        if prop['property_id'] != property_id:
+            raise ValueError("update_property cannot change property_id")
+        self._store.write(position, prop)
+        self._index_property(position)
+        return position
+    
+    def withdraw_property(self, property_id: str):
+        """Remove a property (e.g. once let) from all future matches."""
+        position = self._position(property_id)
+        self._store.deactivate(position)
+        self._index.remove(position)
+        if self._spatial is not None:
+            self._spatial.remove(position)
+        if self._availability is not None:
+            self._availability.remove(position)
+        self._property_set_changed()
+    
+    def _position(self, property_id: str) -> int:
+        """Position of an active property."""
+        if property_id not in self._store.positions_by_id:
+            raise KeyError(f"Unknown property {property_id}")
+        return self._store.positions_by_id[property_id]
+    
+    def _index_property(self, position: int):
+        """Add the stored property at position to the candidate index."""
+        store = self._store
+        self._index.add(
+            position, store.codes['location'][position], store.numeric['beds'][position],
+            store.numeric['affordability'][position], store.access_bits[position]
+        )
+        latitude, longitude = store.coordinates_of([position])[0]
+        if self._spatial is not None:
+            self._spatial.add(position, latitude, longitude)
+        if self._availability is not None:
+            self._availability.add(position, *self._availability_window([position])[:, 0])
+        if self._amenities is not None:
+            self._amenities.set_property(position, latitude, longitude)
+            self._amenity_bits = grow(self._amenity_bits, position)
+            located = not np.isnan(latitude) and not np.isnan(longitude)
+            self._amenity_bits[position] = (
+                self._amenities.bits([position])[0] if located else store.amenity_bits[position]
+            )
+        self._property_set_changed()
+    
+    def _property_set_changed(self):
+        """Drop views derived from the property columns after a change."""
+        self._frame = None
+        self._positions_cache = None
+        self._component_cache = OrderedDict()
+    
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Spatial index over property coordinates, built on first use."""
+        if self._spatial is None:
+            store = self._store
+            coordinates = store.coordinates
+            coordinates[~store.active[:store.size]] = np.nan
+            self._spatial = SpatialIndex(coordinates)
+        return self._spatial
+    
+    def nearby_properties(self, latitude: float, longitude: float,
+                          radius_km: Optional[float] = None,
+                          k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Properties within radius_km of a point, or the k nearest to it.
         
+        Returns:
+            (positions, distances in km), nearest first
+        """
+        if (radius_km is None) == (k is None):
+            raise ValueError("Give exactly one of radius_km and k")
+        if k is not None:
+            return self.spatial_index.nearest(latitude, longitude, k)
+        return self.spatial_index.within(latitude, longitude, radius_km)
+    
+    def _availability_window(self, positions) -> np.ndarray:
+        """First and last available day (rows) of properties, open where not given."""
+        extra = self._store.extra
+        return np.array([
+            to_days(extra[column][positions], missing) if column in extra
+            else np.full(len(positions), missing, dtype=np.int64)
+            for column, missing in (('available_from', OPEN_START), ('available_until', OPEN_END))
+        ])
+    
+    @property
+    def availability_index(self) -> AvailabilityIndex:
+        """Interval index over availability windows, built on first use."""
+        if self._availability is None:
+            store = self._store
+            starts, ends = self._availability_window(np.arange(store.size))
+            self._availability = AvailabilityIndex(starts, ends)
+            for position in np.flatnonzero(~store.active[:store.size]):
+                self._availability.remove(position)
+        return self._availability
+    
+    def available_properties(self, start, end=None) -> np.ndarray:
+        """
+        Positions of properties available at some point from start to end.
+        
+        Properties without available_from are available now; without
+        available_until they stay available.
+        
+        Args:
+            start: First date (date, datetime or ISO string)
+            end: Last date (default: start)
+        """
+        return self.availability_index.overlapping(
+            day_number(start), None if end is None else day_number(end)
+        )
+    
+    def attach_amenities(self, amenities: pd.DataFrame, radius_km: float = AMENITY_RADIUS_KM):
+        """
+        Score amenities from an amenity point layer instead of nearby_amenities text.
+        
+        Distances from every property with coordinates to the nearest
+        amenity of each type are precomputed (see amenity_index), and an
+        amenity within radius_km counts as nearby. Properties without
+        coordinates keep the amenities listed in their text.
+        
+        The layer's amenity bitsets are kept on this matcher, not written to
+        the store, so other matchers over the same (possibly read-only)
+        store are unaffected.
+        
+        Args:
+            amenities: DataFrame with amenity_type, latitude and longitude columns
+            radius_km: Distance within which an amenity counts as nearby
+        """
+        store = self._store
+        coordinates = store.coordinates
+        self._amenities = AmenityIndex(coordinates, amenities, radius_km)
+        located = np.flatnonzero(~np.isnan(coordinates).any(axis=1))
+        self._amenity_bits = store.amenity_bits[:store.size].copy()
+        self._amenity_bits[located] = self._amenities.bits(located)
+        self._amenity_version = uuid.uuid4().hex
+        self._property_set_changed()
+    
+    def add_amenity(self, amenity_type: str, latitude: float, longitude: float) -> np.ndarray:
+        """
+        Add one amenity to the attached layer, updating only the properties it affects.
+        
+        Returns:
+            Positions of properties now nearest to the new amenity
+        """
+        if self._amenities is None:
+            raise ValueError("No amenity layer attached; call attach_amenities first")
+        affected = self._amenities.add_amenity(amenity_type, latitude, longitude)
+        if len(affected):
+            self._amenity_bits[affected] = self._amenities.bits(affected)
+            self._amenity_version = uuid.uuid4().hex
+            self._property_set_changed()
+        return affected
+    
+    @property
+    def amenity_distances(self) -> Optional[np.ndarray]:
+        """Nearest distance (km) per property position and AMENITY_TYPES entry, if a layer is attached."""
+        return None if self._amenities is None else self._amenities.distances[:self._store.size]
+    
+    @property
+    def amenity_bits(self) -> np.ndarray:
+        """Amenity bitsets scored per property position, from the layer if one is attached."""
+        if self._amenity_bits is None:
+            return self._store.amenity_bits[:self._store.size]
+        return self._amenity_bits[:self._store.size]
+    
+    @property
+    def weights(self) -> Dict[str, float]:
+        """Weight of each component used by this matcher."""
+        return dict(zip(self.COMPONENTS, self._weight_vector.tolist()))
+    
+    def set_weights(self, weights: Dict[str, float]):
+        """
+        Replace this matcher's weights, e.g. to try a different policy.
+        
+        Component scores already computed are kept, so re-ranking a recent
+        household under the new weights does not score it again.
+        """
+        self._weight_vector = self.weight_vector(weights)
+    
+    def weight_vector(self, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """
+        Weights as a vector in COMPONENTS order; the matcher's own when None.
+        
+        Raises ValueError unless every component is given, no weight is
+        negative and the weights sum to 1.0.
+        """
+        if weights is None:
+            return self._weight_vector
+        if set(weights) != set(self.COMPONENTS):
+            raise ValueError(f"Weights must be given for exactly {self.COMPONENTS}")
+        vector = np.array([float(weights[c]) for c in self.COMPONENTS])
+        if (vector < 0).any() or not np.isclose(vector.sum(), 1.0):
+            raise ValueError("Weights must be non-negative and sum to 1.0")
+        return vector
+    
+    @property
+    def _active_positions(self) -> np.ndarray:
+        """Positions of active properties, rebuilt lazily after changes."""
+        if self._positions_cache is None:
+            self._positions_cache = self._store.active_positions()
+        return self._positions_cache
+    
     def calculate_bedroom_requirement(self, household_comp: str) -> int:
         """
         Calculate minimum bedrooms needed based on UK bedroom standard.
@@ -42,20 +453,10 @@ class AccommodationMatcher:
         - Couple: 1 bed
         - Each child over 10 or different gender: separate bed
         - Children under 10 same gender: can share
-        """
-        comp_lower = str(household_comp).lower()
         
-        # Extract number of children
-        if 'child' in comp_lower:
-            parts = comp_lower.split(',')
-            for part in parts:
-                if 'child' in part:
-                    num_children = int(''.join(filter(str.isdigit, part.split()[0])))
-                    # Simplified: 1 bed per 2 children + 1 for adults
-                    return 1 + (num_children + 1) // 2
-        
-        # Adults only
-        return 1
+        Parsing is memoized, see household_profile.bedroom_requirement.
+        """
+        return bedroom_requirement(household_comp)
     
     def score_location(self, household_area: str, property_location: str) -> float:
         """
@@ -66,6 +467,13 @@ class AccommodationMatcher:
             return 1.0
         return 0.0
     
+    def score_distance(self, distance_km: float) -> float:
+        """
+        Score location by distance from an anchor point (0-1), in 'distance' mode.
+        On the spot = 1.0, falling linearly to 0.0 at distance_radius_km
+        """
+        return max(0.0, 1.0 - distance_km / self.distance_radius_km)
+    
     def score_bedroom_suitability(self, required_beds: int, available_beds: int) -> float:
         """
         Score bedroom suitability (0-1).
@@ -182,142 +590,484 @@ class AccommodationMatcher:
         
         return score / checks
     
-    def match_household(self, household: Dict) -> List[Dict]:
+    # Row order of the access score table built by _access_matrix
+    ACCESS_REQUIREMENTS = ACCESS_REQUIREMENTS
+    
+    def _location_matrix(self, profiles: List[HouseholdProfile], positions: np.ndarray) -> np.ndarray:
+        """
+        Vectorized score_location, households x properties.
+        
+        In 'distance' mode a household with anchor points scores each
+        property by score_distance, averaged over its anchors.
+        """
+        location_codes = self._store.codes['location'][positions]
+        scores = np.array([
+            np.isin(location_codes, self._store.location_codes_for(p.area))
+            for p in profiles
+        ], dtype=np.float64).reshape(len(profiles), len(positions))
+        if self.location_mode != 'distance':
+            return scores
+        
+        coordinates = self._store.coordinates_of(positions)
+        for i, profile in enumerate(profiles):
+            if not profile.anchors:
+                continue
+            distances = np.array([
+                haversine_km(latitude, longitude, coordinates)
+                for latitude, longitude in profile.anchors
+            ])
+            by_distance = np.maximum(0.0, 1.0 - distances / self.distance_radius_km).mean(axis=0)
+            scores[i] = np.where(np.isnan(by_distance), scores[i], by_distance)
+        return scores
+    
+    def _bedroom_matrix(self, profiles: List[HouseholdProfile], positions: np.ndarray) -> np.ndarray:
+        """Vectorized score_bedroom_suitability, households x properties."""
+        required_beds = np.array([p.required_beds for p in profiles], dtype=np.int64)
+        extra = self._store.numeric['beds'][positions].astype(np.int64)[None, :] - required_beds[:, None]
+        scores = np.maximum(0.3, 1.0 - extra * 0.2)
+        scores = np.where((extra == 0) | (extra == 1), 1.0, scores)
+        return np.where(extra < 0, 0.0, scores)
+    
+    def _affordability_matrix(self, profiles: List[HouseholdProfile], positions: np.ndarray) -> np.ndarray:
+        """Vectorized score_affordability, households x properties."""
+        rents = self._store.numeric['affordability'][positions].astype(np.float64)[None, :]
+        budgets = as_rent([p.budget for p in profiles]).astype(np.float64)[:, None]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = rents / budgets
+        return np.select(
+            [rents > budgets, ratio >= 0.8, ratio >= 0.6],
+            [0.0, 1.0, 0.9],
+            default=0.7
+        )
+    
+    def _access_matrix(self, profiles: List[HouseholdProfile], positions: np.ndarray) -> np.ndarray:
+        """Vectorized score_access_needs, households x properties."""
+        access_bits = self._store.access_bits[positions]
+        wheelchair = has_any(access_bits, ACCESS_FEATURES['wheelchair'])
+        ground_floor = has_any(access_bits, ACCESS_FEATURES['ground floor'])
+        lift = has_any(access_bits, ACCESS_FEATURES['lift'])
+        
+        # One row of property scores per requirement, in ACCESS_REQUIREMENTS order
+        table = np.vstack([
+            np.ones(len(wheelchair)),
+            wheelchair.astype(np.float64),
+            (ground_floor | lift).astype(np.float64),
+            np.where(lift, 1.0, 0.3),
+            np.full(len(wheelchair), 0.5)
+        ])
+        rows = [self.ACCESS_REQUIREMENTS.index(p.access_requirement) for p in profiles]
+        return table[rows]
+    
+    def _amenity_matrix(self, profiles: List[HouseholdProfile], positions: np.ndarray) -> np.ndarray:
+        """Vectorized score_amenities, households x properties."""
+        checks = np.array(
+            [[p.needs_check(i) for i in range(len(AMENITY_CHECKS))] for p in profiles],
+            dtype=np.float64
+        ).reshape(len(profiles), len(AMENITY_CHECKS))
+        amenity_bits = self.amenity_bits[positions]
+        credits = np.column_stack([
+            np.where(has_any(amenity_bits, feature_mask(offers, AMENITY_FEATURES)), credit, 0.0)
+            for _, _, offers, credit in AMENITY_CHECKS
+        ])
+        
+        n_checks = checks.sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = (checks @ credits.T) / n_checks[:, None]
+        return np.where(n_checks[:, None] == 0, 0.5, scores)
+    
+    def _component_tensor(self, profiles: List[HouseholdProfile], positions: np.ndarray) -> np.ndarray:
+        """
+        Score every household against every property (or the given positions).
+        
+        Returns an array of shape (n_households, n_properties, len(COMPONENTS)).
+        """
+        return np.stack([
+            self._location_matrix(profiles, positions),
+            self._bedroom_matrix(profiles, positions),
+            self._affordability_matrix(profiles, positions),
+            self._access_matrix(profiles, positions),
+            self._amenity_matrix(profiles, positions)
+        ], axis=-1)
+    
+    def score_components(self, household: Union[Dict, HouseholdProfile],
+                         positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Score every active property (or the given positions) for a household in one pass.
+        
+        Returns an array of shape (n_properties, len(COMPONENTS)) whose columns
+        match the scalar score_* methods, in COMPONENTS order.
+        """
+        if positions is None:
+            positions = self._active_positions
+        return self._component_tensor([compile_household(household)], positions)[0]
+    
+    def feasible_candidates(self, household: Union[Dict, HouseholdProfile],
+                            same_area: bool = False) -> np.ndarray:
+        """
+        Positions of properties that meet the household's hard constraints.
+        
+        A property is feasible when it has enough beds, is within budget and
+        meets any wheelchair or ground floor need - i.e. none of those
+        component scores would be 0. Uses the candidate index built at
+        construction, so infeasible properties are never scored.
+        
+        Args:
+            household: Household dict or compiled HouseholdProfile
+            same_area: Also require the property to be in the household's area
+        """
+        profile = compile_household(household)
+        return self._index.candidates(
+            profile.required_beds,
+            profile.budget,
+            profile.access_requirement,
+            self._store.location_codes_for(profile.area) if same_area else None
+        )
+    
+    def match_many(self, households_df, chunk_size: int = None,
+                   weights: Optional[Dict[str, float]] = None) -> 'CohortScores':
+        """
+        Score a whole caseload against every property in one pass.
+        
+        Args:
+            households_df: Households, one per row, with the same fields
+                match_household expects (a list of household dicts or
+                HouseholdProfiles is also accepted)
+            chunk_size: Optional number of households scored per block, to
+                bound the size of the intermediate arrays
+            weights: Optional weights for this call only; see also reweight
+        
+        Returns:
+            CohortScores holding a households x properties overall score
+            matrix plus one matrix per scoring component
+        """
+        if chunk_size is None:
+            if not isinstance(households_df, pd.DataFrame):
+                households_df = list(households_df)
+            chunk_size = max(len(households_df), 1)
+        chunks = list(self.iter_match_many(households_df, chunk_size, weights))
+        if not chunks:
+            return self._cohort_scores(
+                [], np.zeros((0, len(self._active_positions), len(self.COMPONENTS))),
+                self.weight_vector(weights)
+            )
+        return CohortScores(
+            household_ids=[hid for c in chunks for hid in c.household_ids],
+            property_ids=chunks[0].property_ids,
+            scores=np.vstack([c.scores for c in chunks]),
+            components={
+                name: np.vstack([c.components[name] for c in chunks])
+                for name in self.COMPONENTS
+            }
+        )
+    
+    def iter_match_many(self, households_df, chunk_size: int = 256,
+                        weights: Optional[Dict[str, float]] = None):
+        """
+        Yield CohortScores for consecutive blocks of chunk_size households.
+        
+        Use this instead of match_many when the full score matrix would not
+        fit comfortably in memory. households_df may also be any iterable of
+        households, e.g. a stream from household_stream; households are
+        compiled one block at a time as it is consumed.
+        """
+        weight_vector = self.weight_vector(weights)
+        if isinstance(households_df, pd.DataFrame):
+            households_df = households_df.to_dict('records')
+        households = iter(households_df)
+        offset = 0
+        while True:
+            block = [compile_household(h) for h in itertools.islice(households, chunk_size)]
+            if not block:
+                return
+            yield self._cohort_scores(
+                block, self._component_tensor(block, self._active_positions), weight_vector, offset
+            )
+            offset += len(block)
+    
+    def reweight(self, cohort: 'CohortScores', weights: Dict[str, float]) -> 'CohortScores':
+        """
+        The same cohort scored under different weights.
+        
+        Only the cohort's component matrices are recombined; nothing is
+        scored again.
+        """
+        tensor = np.stack([cohort.components[name] for name in self.COMPONENTS], axis=-1)
+        return CohortScores(
+            household_ids=cohort.household_ids,
+            property_ids=cohort.property_ids,
+            scores=tensor @ self.weight_vector(weights),
+            components=cohort.components
+        )
+    
+    def _cohort_scores(self, profiles: List[HouseholdProfile], tensor: np.ndarray,
+                       weight_vector: np.ndarray, offset: int = 0) -> 'CohortScores':
+        """
+        Wrap a component tensor as CohortScores.
+        
+        A household without an ID is labelled by its row number in the whole
+        caseload, i.e. offset plus its row in this block.
+        """
+        return CohortScores(
+            household_ids=[
+                offset + i if p.household_id is None else p.household_id
+                for i, p in enumerate(profiles)
+            ],
+            property_ids=self._store.property_ids[self._active_positions].tolist(),
+            scores=tensor @ weight_vector,
+            components={
+                name: tensor[:, :, i] for i, name in enumerate(self.COMPONENTS)
+            }
+        )
+    
+    def match_household(self, household: Union[Dict, HouseholdProfile],
+                        top_k: Optional[int] = None,
+                        feasible_only: bool = False,
+                        weights: Optional[Dict[str, float]] = None,
+                        within_deadline: bool = False,
+                        today=None) -> RankedMatches:
         """
         Match a household to properties and return ranked results.
         
-        Returns list of dicts with:
+        Component scores are computed column-wise by score_components and
+        combined with the matcher's weights (WEIGHTS unless changed) in a
+        single matrix-vector product.
+        
+        Args:
+            household: Household fields as collected by the intake form, or a
+                HouseholdProfile compiled from them
+            top_k: Return only the k best matches. Partitions of the stock
+                whose score upper bound cannot reach the k-th best score are
+                skipped without scoring (see _bounded_candidates), and only
+                the winners are kept. None (the default) returns the full
+                ranking.
+            feasible_only: Score only properties returned by
+                feasible_candidates, dropping every property that fails a
+                bedroom, budget or critical access requirement.
+            weights: Optional weights for this call only (see weight_vector).
+                Component scores of recent households are cached, so
+                re-ranking under new weights costs one matrix-vector product.
+            within_deadline: Score only properties available at some point
+                between today and the day the household reaches the 42-day
+                emergency accommodation limit (today, if already past it)
+            today: Date used by within_deadline (default: the current date)
+        
+        Returns a RankedMatches, best first. Each entry reads as a dict with:
         - property details
         - overall_score
         - component_scores (breakdown)
         - suitability_flags (warnings/issues)
         - match_explanation
         """
-        results = []
-        
         # Extract household requirements
-        required_beds = self.calculate_bedroom_requirement(
-            household.get('household_composition', '1 adult')
+        profile = compile_household(household)
+        weight_vector = self.weight_vector(weights)
+        
+        if within_deadline:
+            positions, components = self._deadline_candidates(profile, feasible_only, today)
+        elif top_k is not None and (profile.scoring_key(), feasible_only) not in self._component_cache:
+            positions, components = self._bounded_candidates(profile, top_k, feasible_only, weight_vector)
+        else:
+            positions, components = self._cached_components(profile, feasible_only)
+        overall_scores = components @ weight_vector
+        
+        order = rank_scores(overall_scores, top_k)
+        return self._ranked(profile, positions[order], overall_scores[order], components[order])
+    
+    def _deadline_candidates(self, profile: HouseholdProfile, feasible_only: bool,
+                             today) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions available before the household's 42-day limit, and their component scores."""
+        first_day = day_number(pd.Timestamp.today() if today is None else today)
+        days_left = max(EMERGENCY_LIMIT_DAYS - profile.length_of_placement, 0)
+        available = self.availability_index.overlapping(first_day, first_day + days_left)
+        positions = (
+            self.feasible_candidates(profile) if feasible_only
+            else self._active_positions
         )
-        household_budget = float(household.get('affordability', 0))
-        household_area = household.get('area_restrictions', '')
-        
-        for _, prop in self.properties.iterrows():
-            # Calculate component scores
-            location_score = self.score_location(
-                household_area, 
-                prop['location']
-            )
-            
-            bedroom_score = self.score_bedroom_suitability(
-                required_beds,
-                int(prop['beds'])
-            )
-            
-            affordability_score = self.score_affordability(
-                household_budget,
-                float(prop['affordability'])
-            )
-            
-            access_score = self.score_access_needs(
-                household.get('access_needs', ''),
-                prop['access_features']
-            )
-            
-            amenities_score = self.score_amenities(
-                household,
-                prop['nearby_amenities']
-            )
-            
-            # Calculate weighted overall score
-            overall_score = (
-                location_score * self.WEIGHTS['location'] +
-                bedroom_score * self.WEIGHTS['bedroom_suitability'] +
-                affordability_score * self.WEIGHTS['affordability'] +
-                access_score * self.WEIGHTS['access_needs'] +
-                amenities_score * self.WEIGHTS['amenities']
-            )
-            
-            # Generate suitability flags
-            flags = []
-            if affordability_score == 0.0:
-                flags.append('⚠️ UNAFFORDABLE - Exceeds budget')
-            if access_score == 0.0:
-                flags.append('⚠️ ACCESS NEEDS NOT MET - Critical requirement')
-            if bedroom_score == 0.0:
-                flags.append('⚠️ INSUFFICIENT BEDROOMS - Below standard')
-            if location_score == 0.0:
-                flags.append('⚠️ WRONG LOCATION - Area restriction not met')
-            
-            # Check 42-day emergency accommodation limit
-            days_in_emergency = int(household.get('length_of_placement', 0))
-            if days_in_emergency >= 42:
-                flags.append('🚨 URGENT - 42-day emergency limit reached/exceeded')
-            elif days_in_emergency >= 35:
-                flags.append('⚠️ WARNING - Approaching 42-day emergency limit')
-            
-            # Generate explanation
-            explanation = self._generate_explanation(
-                location_score, bedroom_score, affordability_score,
-                access_score, amenities_score, prop, household, required_beds
+        positions = np.intersect1d(positions, available, assume_unique=True)
+        return positions, self.score_components(profile, positions)
+    
+    def _cached_components(self, profile: HouseholdProfile,
+                           feasible_only: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positions considered for a household and their component scores.
+        
+        The most recent households are kept in an LRU, dropped whenever the
+        property set changes.
+        """
+        key = (profile.scoring_key(), feasible_only)
+        cached = self._component_cache.pop(key, None)
+        if cached is None:
+            positions = (
+                self.feasible_candidates(profile) if feasible_only
+                else self._active_positions
             )
-            
-            results.append({
-                'property_id': prop['property_id'],
-                'location': prop['location'],
-                'rooms': prop['rooms'],
-                'beds': prop['beds'],
-                'affordability': prop['affordability'],
-                'tenure_length': prop['tenure_length'],
-                'neighbour_quality': prop['neighbour_quality'],
-                'access_features': prop['access_features'],
-                'nearby_amenities': prop['nearby_amenities'],
-                'overall_score': overall_score,
-                'component_scores': {
-                    'location': location_score,
-                    'bedrooms': bedroom_score,
-                    'affordability': affordability_score,
-                    'access': access_score,
-                    'amenities': amenities_score
-                },
-                'suitability_flags': flags,
-                'match_explanation': explanation
-            })
-        
-        # Sort by overall score (descending)
-        results.sort(key=lambda x: x['overall_score'], reverse=True)
-        
-        return results
-    
-    def _generate_explanation(self, loc_score, bed_score, afford_score, 
-                            access_score, amen_score, prop, household, req_beds) -> str:
-        """Generate human-readable explanation of match quality."""
-        explanations = []
-        
-        if loc_score == 1.0:
-            explanations.append(f"✓ Location matches preferred area ({prop['location']})")
-        else:
-            explanations.append(f"✗ Location mismatch (property in {prop['location']})")
+            cached = (positions, self.score_components(profile, positions))
+        self._component_cache[key] = cached
+        while len(self._component_cache) > _COMPONENT_CACHE_SIZE:
+            self._component_cache.popitem(last=False)
+        return cached
+    
+    def _score_bounds(self, profile: HouseholdProfile, weight_vector: np.ndarray):
+        """
+        Function giving an upper bound on the overall score of any property
+        with a given location code, bed count and affordability.
         
-        if bed_score == 1.0:
-            explanations.append(f"✓ Suitable bedroom count ({prop['beds']} beds for {req_beds} required)")
-        elif bed_score == 0.0:
-            explanations.append(f"✗ Insufficient bedrooms ({prop['beds']} available, {req_beds} required)")
-        else:
-            explanations.append(f"~ Over-provision ({prop['beds']} beds for {req_beds} required)")
+        Location (unless scored by distance) and bedroom scores are exact
+        for such a group; the other scores are bounded by the best this
+        household can get.
+        """
+        area_codes = set(self._store.location_codes_for(profile.area).tolist())
+        by_distance = self.location_mode == 'distance' and bool(profile.anchors)
+        access_max = 0.5 if profile.access_requirement == 'other' else 1.0
+        credits = [
+            credit for i, (_, _, _, credit) in enumerate(AMENITY_CHECKS) if profile.needs_check(i)
+        ]
+        amenities_max = sum(credits) / len(credits) if credits else 0.5
         
-        if afford_score == 1.0:
-            explanations.append(f"✓ Within budget (£{prop['affordability']}/month)")
-        elif afford_score == 0.0:
-            explanations.append(f"✗ Over budget (£{prop['affordability']} vs £{household.get('affordability')} budget)")
-        else:
-            explanations.append(f"~ Well under budget (£{prop['affordability']}/month)")
+        def bound(location_code: int, beds: int, affordable: bool) -> float:
+            return float(np.array([
+                1.0 if by_distance or location_code in area_codes else 0.0,
+                self.score_bedroom_suitability(profile.required_beds, beds),
+                1.0 if affordable else 0.0,
+                access_max,
+                amenities_max
+            ]) @ weight_vector)
+        return bound
+    
+    def _bounded_candidates(self, profile: HouseholdProfile, top_k: int, feasible_only: bool,
+                            weight_vector: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Positions (and component scores) that can hold a household's top_k.
         
-        if access_score == 1.0:
-            explanations.append("✓ Access needs met")
-        elif access_score == 0.0:
-            explanations.append("✗ Critical access needs NOT met")
-        else:
-            explanations.append("~ Partial access needs match")
+        Partitions of the candidate index - one (location, beds) bucket, later
+        split into its affordable and over-budget members - are scored in
+        descending order of their score upper bound. Once k properties have
+        been scored, a partition whose bound is below the k-th best score
+        cannot contribute and the search stops, so e.g. other areas and
+        under-bedded units are never scored when enough good units exist.
+        Only partitions strictly below the k-th score are skipped, so ties
+        resolve exactly as in an exhaustive ranking.
+        """
+        if top_k <= 0:
+            return np.array([], dtype=np.intp), np.zeros((0, len(self.COMPONENTS)))
+        bound = self._score_bounds(profile, weight_vector)
+        budget = as_rent(profile.budget)
+        tiebreak = itertools.count()
+        heap = []
+        for location_code, beds, min_rent in self._index.partitions():
+            if feasible_only and (beds < profile.required_beds or min_rent > budget):
+                continue
+            affordable = not min_rent > budget
+            heap.append((-bound(location_code, beds, affordable), next(tiebreak), location_code, beds, None))
+        heapq.heapify(heap)
+        
+        found_positions, found_components, found_scores = [], [], []
+        n_found, kth_score = 0, -np.inf
+        while heap:
+            negative_bound, _, location_code, beds, over_budget = heapq.heappop(heap)
+            if n_found >= top_k and -negative_bound + _BOUND_TOLERANCE < kth_score:
+                break
+            if over_budget is not None:
+                positions = over_budget
+            elif feasible_only:
+                positions = self._index.partition(
+                    location_code, beds, profile.budget, profile.access_requirement
+                )
+            else:
+                # Score the affordable members now; the rest get their own,
+                # lower bound
+                positions = self._index.partition(location_code, beds)
+                over = self._store.numeric['affordability'][positions] > budget
+                if over.any() and not over.all():
+                    heapq.heappush(heap, (
+                        -bound(location_code, beds, False), next(tiebreak),
+                        location_code, beds, positions[over]
+                    ))
+                    positions = positions[~over]
+            if not len(positions):
+                continue
+            components = self.score_components(profile, positions)
+            found_positions.append(positions)
+            found_components.append(components)
+            found_scores.append(components @ weight_vector)
+            n_found += len(positions)
+            if n_found >= top_k:
+                scores = np.concatenate(found_scores)
+                kth_score = np.partition(scores, n_found - top_k)[n_found - top_k]
         
-        return " | ".join(explanations)
+        if not found_positions:
+            return np.array([], dtype=np.intp), np.zeros((0, len(self.COMPONENTS)))
+        positions = np.concatenate(found_positions)
+        order = np.argsort(positions, kind='stable')
+        return positions[order], np.vstack(found_components)[order]
+    
+    def iter_matches(self, household: Union[Dict, HouseholdProfile],
+                     batch_size: int = 50,
+                     feasible_only: bool = False,
+                     weights: Optional[Dict[str, float]] = None) -> Iterator[RankedMatches]:
+        """
+        Yield a household's ranking in descending score order, batch_size matches at a time.
+        
+        Concatenating the batches gives exactly match_household's ranking.
+        Every property has to be scored before the first batch is known, but
+        only overall scores are kept (scored in blocks of properties);
+        component scores and result rows are built per batch as they are
+        pulled. Batches are selected from blocks of the unseen properties
+        that double in size as the caller reads on, so reading the first
+        pages costs linear time and reading everything costs one sort.
+        
+        Args:
+            household: Household dict or compiled HouseholdProfile
+            batch_size: Matches per yielded RankedMatches
+            feasible_only: As for match_household
+            weights: As for match_household
+        """
+        profile = compile_household(household)
+        weight_vector = self.weight_vector(weights)
+        positions = (
+            self.feasible_candidates(profile) if feasible_only
+            else self._active_positions
+        )
+        scores = np.concatenate([np.zeros(0)] + [
+            self.score_components(profile, positions[start:start + _SCORE_BLOCK]) @ weight_vector
+            for start in range(0, len(positions), _SCORE_BLOCK)
+        ])
+        
+        # Indices into positions not yet yielded, in position order so ties
+        # break exactly as in rank_scores
+        unseen = np.arange(len(positions))
+        while len(unseen):
+            block = rank_scores(scores[unseen], max(batch_size, len(positions) - len(unseen)))
+            for start in range(0, len(block), batch_size):
+                rows = unseen[block[start:start + batch_size]]
+                batch_positions = positions[rows]
+                yield self._ranked(
+                    profile, batch_positions, scores[rows],
+                    self.score_components(profile, batch_positions)
+                )
+            unseen = np.delete(unseen, block)
+    
+    def _ranked(self, profile: HouseholdProfile, positions: np.ndarray,
+                scores: np.ndarray, components: np.ndarray) -> RankedMatches:
+        """Wrap ranked positions and their scores as RankedMatches."""
+        return RankedMatches(
+            self._store,
+            positions,
+            scores,
+            components,
+            reason_codes(
+                components, profile.length_of_placement, self._scored_by_distance(profile, positions)
+            ),
+            profile.required_beds,
+            profile.stated_budget
+        )
+    
+    def _scored_by_distance(self, profile: HouseholdProfile, positions: np.ndarray) -> Optional[np.ndarray]:
+        """Mask of the positions whose location score is a distance score (see _location_matrix)."""
+        if self.location_mode != 'distance' or not profile.anchors:
+            return None
+        return ~np.isnan(self._store.coordinates_of(positions)).any(axis=1)
+    
+    def explain(self, result: MatchResult) -> str:
+        """Render (or return the cached) explanation for a match result."""
+        return result['match_explanation']
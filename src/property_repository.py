@@ -0,0 +1,225 @@
+"""
+SQLite-backed property repository.
+
+Keeps the property stock in a local SQLite file (no server) so a matcher can
+be built over just the properties a household could take, instead of
+loading and filtering the whole stock. Hard constraints are pushed down
+into SQL and answered from indexes:
+- location (normalised as in the matcher) plus beds and rent
+- beds plus rent, and rent alone
+- access features, kept in a normalised (property, feature) table with one
+  row per keyword from feature_encoding.ACCESS_FEATURES
+
+The constraints match AccommodationMatcher.feasible_candidates: enough
+beds, rent within budget, and any wheelchair or ground floor need met.
+"""
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from columnar_data import PROPERTY_COLUMNS
+from feature_encoding import ACCESS_FEATURES, encode_text
+from household_profile import HouseholdProfile, compile_household
+from property_store import as_rent
+
+# SQLite column types; other property columns are stored as TEXT
+_COLUMN_TYPES = {
+    'beds': 'INTEGER',
+    'rooms': 'INTEGER',
+    'affordability': 'REAL',
+    'latitude': 'REAL',
+    'longitude': 'REAL',
+}
+
+# Access features that satisfy each mandatory access requirement
+_ACCESS_PUSHDOWN = {
+    'wheelchair': ('wheelchair',),
+    'ground floor': ('ground floor', 'lift'),
+}
+
+_INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_properties_location ON properties (location_key, beds, affordability)',
+    'CREATE INDEX IF NOT EXISTS idx_properties_beds ON properties (beds, affordability)',
+    'CREATE INDEX IF NOT EXISTS idx_properties_affordability ON properties (affordability)',
+    'CREATE INDEX IF NOT EXISTS idx_access_features ON access_features (feature, property_row)',
+]
+
+
+class PropertyRepository:
+    """Property stock in SQLite, queried with hard constraints pushed down."""
+
+    def __init__(self, path: Union[str, Path] = ':memory:'):
+        """
+        Open (or create) a repository.
+
+        Args:
+            path: SQLite database file, or ':memory:' for a private in-memory one
+        """
+        self.path = str(path)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute('PRAGMA foreign_keys = ON')
+        self.columns: List[str] = [
+            row[1] for row in self._conn.execute('PRAGMA table_info(properties)')
+            if row[1] not in ('row_id', 'location_key')
+        ]
+
+    @classmethod
+    def from_dataframe(cls, properties_df: pd.DataFrame,
+                       path: Union[str, Path] = ':memory:') -> 'PropertyRepository':
+        """Create a repository holding the properties of a DataFrame, replacing any existing stock."""
+        repository = cls(path)
+        repository.import_properties(properties_df)
+        return repository
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> 'PropertyRepository':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        if not self.columns:
+            return 0
+        return self._conn.execute('SELECT COUNT(*) FROM properties').fetchone()[0]
+
+    def import_properties(self, properties_df: pd.DataFrame):
+        """Replace the stored stock with the matcher columns of properties_df."""
+        self.columns = [name for name in properties_df.columns if name in PROPERTY_COLUMNS]
+        definitions = ', '.join(
+            f'{name} {_COLUMN_TYPES.get(name, "TEXT")}' for name in self.columns if name != 'property_id'
+        )
+        with self._conn:
+            self._conn.execute('DROP TABLE IF EXISTS access_features')
+            self._conn.execute('DROP TABLE IF EXISTS properties')
+            self._conn.execute(
+                'CREATE TABLE properties (row_id INTEGER PRIMARY KEY, '
+                f'property_id TEXT UNIQUE NOT NULL, location_key TEXT, {definitions})'
+            )
+            self._conn.execute(
+                'CREATE TABLE access_features (property_row INTEGER NOT NULL '
+                'REFERENCES properties (row_id) ON DELETE CASCADE, feature TEXT NOT NULL)'
+            )
+            rows = [self._row(record) for record in properties_df[self.columns].to_dict('records')]
+            self._conn.executemany(self._insert_sql(), [values for values, _ in rows])
+            self._conn.executemany(
+                'INSERT INTO access_features (property_row, feature) VALUES (?, ?)',
+                [(row_id, feature) for row_id, (_, features) in enumerate(rows, 1) for feature in features]
+            )
+            for statement in _INDEXES:
+                self._conn.execute(statement)
+
+    def _insert_sql(self) -> str:
+        names = ['property_id', 'location_key'] + [n for n in self.columns if n != 'property_id']
+        return f'INSERT INTO properties ({", ".join(names)}) VALUES ({", ".join("?" * len(names))})'
+
+    def _row(self, prop: Dict):
+        """Column values and access feature keywords of one property."""
+        stored = {n: _sql_value(prop.get(n)) for n in self.columns if n != 'property_id'}
+        # Rent is kept in the matcher's precision, so pushed-down budget
+        # checks agree with it exactly
+        if stored.get('affordability') is not None:
+            stored['affordability'] = float(as_rent(stored['affordability']))
+        values = [prop['property_id'], _location_key(stored.get('location'))] + list(stored.values())
+        bits = encode_text(prop.get('access_features'), ACCESS_FEATURES)
+        return values, [feature for feature, bit in ACCESS_FEATURES.items() if bits & bit]
+
+    def add_property(self, prop: Dict):
+        """Add one property (same fields as a property_data.csv row)."""
+        values, features = self._row(prop)
+        with self._conn:
+            row_id = self._conn.execute(self._insert_sql(), values).lastrowid
+            self._conn.executemany(
+                'INSERT INTO access_features (property_row, feature) VALUES (?, ?)',
+                [(row_id, feature) for feature in features]
+            )
+
+    def remove_property(self, property_id: str):
+        """Withdraw a property; its access features go with it."""
+        with self._conn:
+            self._conn.execute('DELETE FROM properties WHERE property_id = ?', (property_id,))
+
+    def query(self, area: Optional[str] = None, min_beds: Optional[int] = None,
+              max_rent: Optional[float] = None, access_requirement: str = 'none') -> pd.DataFrame:
+        """
+        Properties meeting the given constraints, in the order they were stored.
+
+        Args:
+            area: Only properties in this location (compared like the matcher:
+                case-insensitive, ignoring surrounding spaces)
+            min_beds: Minimum number of beds
+            max_rent: Maximum monthly rent; properties with unknown rent are kept
+            access_requirement: One of AccommodationMatcher.ACCESS_REQUIREMENTS;
+                'wheelchair' and 'ground floor' are mandatory needs
+
+        Returns:
+            DataFrame with the stored property columns
+        """
+        conditions, params = [], []
+        if area is not None:
+            conditions.append('location_key = ?')
+            params.append(_location_key(area))
+        if min_beds is not None:
+            conditions.append('beds >= ?')
+            params.append(int(min_beds))
+        if max_rent is not None:
+            conditions.append('(affordability <= ? OR affordability IS NULL)')
+            params.append(float(as_rent(max_rent)))
+        features = _ACCESS_PUSHDOWN.get(access_requirement)
+        if features:
+            conditions.append(
+                'row_id IN (SELECT property_row FROM access_features '
+                f'WHERE feature IN ({", ".join("?" * len(features))}))'
+            )
+            params.extend(features)
+        where = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+        return self._select(where, params)
+
+    def candidates(self, household: Union[Dict, HouseholdProfile],
+                   same_area: bool = False) -> pd.DataFrame:
+        """
+        Properties that meet a household's hard constraints.
+
+        The same set as AccommodationMatcher.feasible_candidates, selected in SQL.
+        """
+        profile = compile_household(household)
+        return self.query(
+            area=profile.area if same_area else None,
+            min_beds=profile.required_beds,
+            max_rent=profile.budget,
+            access_requirement=profile.access_requirement
+        )
+
+    def all_properties(self) -> pd.DataFrame:
+        """Every stored property."""
+        return self._select('', [])
+
+    def _select(self, where: str, params: List) -> pd.DataFrame:
+        """Stored columns of the rows matching a WHERE clause, as loaded from CSV."""
+        if not self.columns:
+            raise ValueError("The repository holds no properties; call import_properties first")
+        df = pd.read_sql_query(
+            f'SELECT {", ".join(self.columns)} FROM properties{where} ORDER BY row_id',
+            self._conn, params=params
+        )
+        for name in ('beds', 'rooms'):
+            if name in df.columns and df[name].notna().all():
+                df[name] = df[name].astype('int64')
+        return df
+
+
+def _sql_value(value):
+    """A property value as SQLite stores it: plain Python, None when missing."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _location_key(location) -> Optional[str]:
+    """Location as the matcher compares it."""
+    return None if location is None else str(location).lower().strip()
@@ -0,0 +1,381 @@
+"""
+Columnar, typed storage for the property stock.
+
+The matcher only needs a few small values per property to score it, so
+instead of a pandas DataFrame (and a boxed Series per row) the stock is held
+as parallel NumPy arrays:
+- beds and rooms as int16
+- rent as float32
+- location and other repeated text as integer codes into category lists
+- access and amenity features as bitsets (see feature_encoding)
+- latitude and longitude, when present, as float64
+
+A store can back several matchers without being copied. Call freeze() to
+make it read-only before sharing it between matchers or processes.
+
+data_version stamps the stored data: stores loaded from identical data share
+a stamp, and any change gives the store a new one, so caches keyed on it go
+stale automatically.
+"""
+import hashlib
+import uuid
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional
+
+from feature_encoding import (
+    ACCESS_FEATURES, AMENITY_FEATURES, BITSET_DTYPE, encode_features, encode_text
+)
+from growable import grow
+
+# Text columns with few distinct values, stored as category codes
+CATEGORICAL_COLUMNS = [
+    'location', 'neighbour_quality', 'tenure_length', 'access_features', 'nearby_amenities'
+]
+
+# Typed numeric columns: name -> dtype
+NUMERIC_COLUMNS = {
+    'beds': np.int16,
+    'rooms': np.int16,
+    'affordability': np.float32,
+}
+
+# Rents are stored in single precision. Budgets are compared with them in the
+# same precision (see as_rent), so a rent equal to the budget stays affordable.
+RENT_DTYPE = NUMERIC_COLUMNS['affordability']
+
+# Optional coordinate columns (degrees), stored as numeric columns when the
+# data has them; a property without them gets NaN
+COORDINATE_COLUMNS = ['latitude', 'longitude']
+
+# Code used for missing categorical values
+MISSING = -1
+
+# Optional precomputed bitset columns (see columnar_data.typed_properties):
+# feature text column -> bitset column
+BITSET_COLUMNS = {'access_features': 'access_bits', 'nearby_amenities': 'amenity_bits'}
+
+
+def as_rent(values):
+    """Rents or budgets in the precision rents are stored in, for comparing them."""
+    return np.asarray(values, dtype=np.float64).astype(RENT_DTYPE)
+
+
+def _display_number(value):
+    """
+    Plain Python number for display, keeping whole numbers as int.
+
+    Single-precision values are rounded to their shortest repr, so a rent
+    stored as 812.7 reads back as 812.7.
+    """
+    value = float(np.format_float_positional(value, unique=True, trim='-'))
+    return int(value) if value.is_integer() else value
+
+
+class PropertyStore:
+    """Typed column arrays for a set of properties, addressed by position."""
+
+    def __init__(self, columns: List[str]):
+        """Create an empty store with the given column order."""
+        self.columns = list(columns)
+        self.size = 0
+        self.read_only = False
+        self._data_version: Optional[str] = None
+
+        self.property_ids = np.empty(0, dtype=object)
+        self.numeric = {name: np.zeros(0, dtype=dtype) for name, dtype in NUMERIC_COLUMNS.items()}
+        self.numeric.update({
+            name: np.zeros(0, dtype=np.float64) for name in COORDINATE_COLUMNS if name in self.columns
+        })
+        self.codes = {name: np.zeros(0, dtype=np.int32) for name in CATEGORICAL_COLUMNS}
+        self.categories: Dict[str, List[Any]] = {name: [] for name in CATEGORICAL_COLUMNS}
+        self._category_codes: Dict[str, Dict[Any, int]] = {name: {} for name in CATEGORICAL_COLUMNS}
+        self.extra = {
+            name: np.empty(0, dtype=object) for name in self.columns
+            if name != 'property_id' and name not in self.numeric and name not in CATEGORICAL_COLUMNS
+        }
+        self.access_bits = np.zeros(0, dtype=BITSET_DTYPE)
+        self.amenity_bits = np.zeros(0, dtype=BITSET_DTYPE)
+        self.active = np.zeros(0, dtype=bool)
+        self.positions_by_id: Dict[str, int] = {}
+
+        # Normalised (lower-case, stripped) key of each location category
+        self.location_keys: List[str] = []
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'PropertyStore':
+        """
+        Build a store from a property DataFrame (as read from property_data.csv).
+
+        Each column is converted as a whole: numbers with one cast, text by
+        coding its distinct values once. Precomputed bitset columns (and
+        categorical columns from a typed load) are used as they are.
+        """
+        bitset_columns = set(BITSET_COLUMNS.values())
+        store = cls([name for name in df.columns if name not in bitset_columns])
+        n = len(df)
+        store.size = n
+        store.property_ids = np.array(df['property_id'].tolist(), dtype=object)
+        for name, column in store.numeric.items():
+            store.numeric[name] = np.asarray(pd.to_numeric(df[name]), dtype=np.float64).astype(column.dtype)
+        for name in CATEGORICAL_COLUMNS:
+            codes, values = pd.factorize(df[name])
+            lookup = np.array([store._category_code(name, v) for v in values] + [MISSING], dtype=np.int32)
+            store.codes[name] = lookup[codes].reshape(n)
+        for name in store.extra:
+            store.extra[name] = np.array(df[name].tolist(), dtype=object).reshape(n)
+        for text, features, attribute in [
+            ('access_features', ACCESS_FEATURES, 'access_bits'),
+            ('nearby_amenities', AMENITY_FEATURES, 'amenity_bits'),
+        ]:
+            bits = df[attribute] if attribute in df.columns else encode_features(df[text], features)
+            setattr(store, attribute, np.asarray(bits, dtype=BITSET_DTYPE).copy())
+        store.active = np.ones(n, dtype=bool)
+        store.positions_by_id = dict(zip(store.property_ids.tolist(), range(n)))
+        return store
+
+    def _category_code(self, name: str, value) -> int:
+        """Code of a categorical value, registering new categories."""
+        if pd.isna(value):
+            return MISSING
+        codes = self._category_codes[name]
+        if value not in codes:
+            codes[value] = len(self.categories[name])
+            self.categories[name].append(value)
+            if name == 'location':
+                self.location_keys.append(str(value).lower().strip())
+        return codes[value]
+
+    def _decode(self, name: str, code: int):
+        """Categorical value for a code."""
+        return np.nan if code == MISSING else self.categories[name][code]
+
+    def __len__(self) -> int:
+        """Number of active properties."""
+        return len(self.positions_by_id)
+
+    @property
+    def beds(self) -> np.ndarray:
+        return self.numeric['beds'][:self.size]
+
+    @property
+    def rents(self) -> np.ndarray:
+        return self.numeric['affordability'][:self.size]
+
+    @property
+    def location_codes(self) -> np.ndarray:
+        return self.codes['location'][:self.size]
+
+    @property
+    def has_coordinates(self) -> bool:
+        return all(name in self.numeric for name in COORDINATE_COLUMNS)
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """(latitude, longitude) per position; NaN where unknown."""
+        if not self.has_coordinates:
+            return np.full((self.size, 2), np.nan)
+        return np.column_stack([self.numeric[name][:self.size] for name in COORDINATE_COLUMNS])
+
+    def coordinates_of(self, positions) -> np.ndarray:
+        """(latitude, longitude) of some positions, without building the full array."""
+        positions = np.asarray(positions, dtype=np.intp)
+        if not self.has_coordinates:
+            return np.full((len(positions), 2), np.nan)
+        return np.column_stack([self.numeric[name][positions] for name in COORDINATE_COLUMNS])
+
+    def active_positions(self) -> np.ndarray:
+        """Positions of properties that have not been withdrawn."""
+        return np.flatnonzero(self.active[:self.size])
+
+    def location_codes_for(self, area: str) -> np.ndarray:
+        """Location codes whose normalised name equals area."""
+        key = str(area).lower().strip()
+        return np.array(
+            [code for code, loc_key in enumerate(self.location_keys) if loc_key == key],
+            dtype=np.int32
+        )
+
+    def record(self, position: int) -> Dict[str, Any]:
+        """All fields of one property as plain Python values."""
+        property_id = self.property_ids[position]
+        values = {'property_id': str(property_id) if isinstance(property_id, np.str_) else property_id}
+        for name, column in self.numeric.items():
+            values[name] = _display_number(column[position])
+        for name in CATEGORICAL_COLUMNS:
+            values[name] = self._decode(name, self.codes[name][position])
+        for name, column in self.extra.items():
+            values[name] = column[position]
+        return {name: values[name] for name in self.columns}
+
+    def to_dataframe(self, positions: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """Properties as a DataFrame indexed by position (active ones by default)."""
+        if positions is None:
+            positions = self.active_positions()
+        positions = np.asarray(positions, dtype=np.intp)
+        data = {'property_id': self.property_ids[positions]}
+        for name, column in self.numeric.items():
+            data[name] = column[positions]
+        for name in CATEGORICAL_COLUMNS:
+            data[name] = pd.Categorical.from_codes(
+                self.codes[name][positions], categories=pd.Index(self.categories[name], dtype=object)
+            ) if self.categories[name] else np.full(len(positions), np.nan, dtype=object)
+        for name, column in self.extra.items():
+            data[name] = column[positions]
+        return pd.DataFrame({name: data[name] for name in self.columns}, index=positions)
+
+    def take(self, positions: Iterable[int]) -> 'PropertyStore':
+        """
+        A read-only copy of some properties, position i holding positions[i].
+
+        Later writes and withdrawals in this store do not reach the copy.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        taken = PropertyStore(self.columns)
+        taken.size = len(positions)
+        taken.property_ids = self.property_ids[positions]
+        taken.numeric = {name: column[positions] for name, column in self.numeric.items()}
+        taken.codes = {name: column[positions] for name, column in self.codes.items()}
+        taken.categories = {name: list(values) for name, values in self.categories.items()}
+        taken._category_codes = {name: dict(codes) for name, codes in self._category_codes.items()}
+        taken.location_keys = list(self.location_keys)
+        taken.extra = {name: column[positions] for name, column in self.extra.items()}
+        taken.access_bits = self.access_bits[positions]
+        taken.amenity_bits = self.amenity_bits[positions]
+        taken.active = self.active[positions]
+        live = np.flatnonzero(taken.active)
+        taken.positions_by_id = dict(zip(taken.property_ids[live].tolist(), live.tolist()))
+        return taken.freeze()
+
+    @property
+    def data_version(self) -> str:
+        """Stamp of the stored data; changes whenever a property is written or withdrawn."""
+        if self._data_version is None:
+            self._data_version = self._content_hash()
+        return self._data_version
+
+    def _content_hash(self) -> str:
+        """Hash of every stored value, so identical loads share a version."""
+        digest = hashlib.blake2b(digest_size=16)
+        arrays, header = self.export_arrays()
+        for key in sorted(arrays):
+            digest.update(key.encode())
+            digest.update(np.ascontiguousarray(arrays[key]).tobytes())
+        digest.update(repr((
+            header['columns'], header['categories'],
+            {name: column.tolist() for name, column in header['extra'].items()}
+        )).encode())
+        return digest.hexdigest()
+
+    def _modified(self):
+        """Give the store a fresh data version after a change."""
+        self._data_version = uuid.uuid4().hex
+
+    def export_arrays(self):
+        """
+        Split the store into fixed-width arrays and a small picklable header.
+
+        The arrays (everything needed for scoring, plus property IDs as
+        fixed-width strings) can be placed in shared memory; from_arrays
+        rebuilds a store around them without copying.
+        """
+        arrays = {
+            'property_ids': np.array(self.property_ids[:self.size].tolist(), dtype=str),
+            'access_bits': self.access_bits[:self.size],
+            'amenity_bits': self.amenity_bits[:self.size],
+            'active': self.active[:self.size],
+        }
+        arrays.update({f'numeric.{n}': c[:self.size] for n, c in self.numeric.items()})
+        arrays.update({f'codes.{n}': c[:self.size] for n, c in self.codes.items()})
+        header = {
+            'columns': self.columns,
+            'categories': self.categories,
+            'extra': {n: c[:self.size] for n, c in self.extra.items()},
+        }
+        return arrays, header
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], header: Dict) -> 'PropertyStore':
+        """Rebuild a read-only store around arrays from export_arrays."""
+        store = cls(header['columns'])
+        store.size = len(arrays['active'])
+        store.property_ids = arrays['property_ids']
+        store.access_bits = arrays['access_bits']
+        store.amenity_bits = arrays['amenity_bits']
+        store.active = arrays['active']
+        store.numeric = {
+            key.split('.', 1)[1]: array for key, array in arrays.items() if key.startswith('numeric.')
+        }
+        store.codes = {n: arrays[f'codes.{n}'] for n in CATEGORICAL_COLUMNS}
+        store.extra = dict(header['extra'])
+        for name in CATEGORICAL_COLUMNS:
+            for value in header['categories'][name]:
+                store._category_code(name, value)
+        store.positions_by_id = {
+            str(pid): i for i, pid in enumerate(store.property_ids) if store.active[i]
+        }
+        return store.freeze()
+
+    def freeze(self) -> 'PropertyStore':
+        """Make the store read-only so it can be shared safely."""
+        self.read_only = True
+        for column in self._arrays():
+            column.flags.writeable = False
+        return self
+
+    def _arrays(self) -> List[np.ndarray]:
+        """Every per-position column array."""
+        return (
+            [self.property_ids, self.access_bits, self.amenity_bits, self.active]
+            + list(self.numeric.values()) + list(self.codes.values()) + list(self.extra.values())
+        )
+
+    def _check_writable(self):
+        if self.read_only:
+            raise ValueError("PropertyStore is read-only")
+
+    def _ensure_capacity(self, size: int):
+        """Grow every column (by doubling) to hold size positions."""
+        position = size - 1
+        self.property_ids = grow(self.property_ids, position)
+        self.access_bits = grow(self.access_bits, position)
+        self.amenity_bits = grow(self.amenity_bits, position)
+        self.active = grow(self.active, position)
+        self.numeric = {name: grow(column, position) for name, column in self.numeric.items()}
+        self.codes = {name: grow(column, position) for name, column in self.codes.items()}
+        self.extra = {name: grow(column, position) for name, column in self.extra.items()}
+
+    def append(self, prop: Dict[str, Any]) -> int:
+        """Add a property at the next free position and return that position."""
+        self._check_writable()
+        if prop['property_id'] in self.positions_by_id:
+            raise ValueError(f"Property {prop['property_id']} already exists")
+        position = self.size
+        self._ensure_capacity(position + 1)
+        self.size += 1
+        self.write(position, prop)
+        return position
+
+    def write(self, position: int, prop: Dict[str, Any]):
+        """Overwrite every column of the property at position."""
+        self._check_writable()
+        self.property_ids[position] = prop['property_id']
+        for name, column in self.numeric.items():
+            column[position] = float(prop.get(name, np.nan) if name in COORDINATE_COLUMNS else prop[name])
+        for name, column in self.codes.items():
+            column[position] = self._category_code(name, prop[name])
+        for name, column in self.extra.items():
+            column[position] = prop.get(name)
+        self.access_bits[position] = encode_text(prop['access_features'], ACCESS_FEATURES)
+        self.amenity_bits[position] = encode_text(prop['nearby_amenities'], AMENITY_FEATURES)
+        self.active[position] = True
+        self.positions_by_id[prop['property_id']] = position
+        self._modified()
+
+    def deactivate(self, position: int):
+        """Withdraw the property at position; its slot is not reused."""
+        self._check_writable()
+        del self.positions_by_id[self.property_ids[position]]
+        self.active[position] = False
+        self._modified()
@@ -0,0 +1,123 @@
+"""
+Spatial index over property coordinates.
+
+Properties may carry latitude/longitude columns. The index answers radius
+and k-nearest queries in great-circle kilometres with a scikit-learn
+BallTree (haversine metric), so a query touches only the tree nodes near
+the point instead of every property.
+
+A BallTree cannot be updated in place, so new or moved properties are
+measured directly until enough have accumulated to rebuild the tree (see
+growable.DeferredRebuild).
+"""
+import numpy as np
+from sklearn.neighbors import BallTree
+from typing import Tuple
+
+from growable import DeferredRebuild, grow
+
+# Mean Earth radius
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(latitude: float, longitude: float, coordinates: np.ndarray) -> np.ndarray:
+    """Great-circle distance in km from a point to each (latitude, longitude) row."""
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(coordinates[:, 0]), np.radians(coordinates[:, 1])
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class SpatialIndex(DeferredRebuild):
+    """Radius and nearest-neighbour queries over property positions."""
+
+    def __init__(self, coordinates: np.ndarray):
+        """
+        Args:
+            coordinates: (latitude, longitude) in degrees per property
+                position; rows with a NaN are not indexed
+        """
+        self._coordinates = np.array(coordinates, dtype=np.float64).reshape(-1, 2)
+        self._live = ~np.isnan(self._coordinates).any(axis=1)
+        self._build()
+
+    def _build(self):
+        """(Re)build the tree over every live position."""
+        self._tree_positions = np.flatnonzero(self._live)
+        self._tree = BallTree(
+            np.radians(self._coordinates[self._tree_positions]).reshape(-1, 2), metric='haversine'
+        ) if len(self._tree_positions) else None
+        self._in_tree = np.zeros(len(self._live), dtype=bool)
+        self._in_tree[self._tree_positions] = True
+        self._reset_pending()
+
+    def _ensure_capacity(self, position: int):
+        """Grow the per-position columns (by doubling) to hold position."""
+        self._coordinates = grow(self._coordinates, position, np.nan)
+        self._live = grow(self._live, position)
+        self._in_tree = grow(self._in_tree, position)
+
+    def add(self, position: int, latitude: float, longitude: float):
+        """Index (or re-index) the property at position."""
+        self.remove(position)
+        if np.isnan(latitude) or np.isnan(longitude):
+            return
+        self._ensure_capacity(position)
+        self._coordinates[position] = (latitude, longitude)
+        self._queue(position, len(self._tree_positions))
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Properties within radius_km of a point.
+
+        Returns:
+            (positions, distances in km), nearest first
+        """
+        found, distances = [np.array([], dtype=np.intp)], [np.array([])]
+        if self._tree is not None:
+            index, distance = self._tree.query_radius(
+                np.radians([[latitude, longitude]]), r=radius_km / EARTH_RADIUS_KM,
+                return_distance=True
+            )
+            positions = self._tree_positions[index[0]]
+            keep = self._in_tree[positions]
+            found.append(positions[keep])
+            distances.append(distance[0][keep] * EARTH_RADIUS_KM)
+        pending = self._pending_positions()
+        pending_distances = haversine_km(latitude, longitude, self._coordinates[pending])
+        keep = pending_distances <= radius_km
+        found.append(pending[keep])
+        distances.append(pending_distances[keep])
+        return self._sorted(np.concatenate(found), np.concatenate(distances))
+
+    def nearest(self, latitude: float, longitude: float, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The k properties nearest to a point.
+
+        Returns:
+            (positions, distances in km), nearest first
+        """
+        found, distances = [np.array([], dtype=np.intp)], [np.array([])]
+        if self._tree is not None and k > 0:
+            # Ask for enough extra neighbours to cover stale tree entries
+            distance, index = self._tree.query(
+                np.radians([[latitude, longitude]]), k=min(k + self._stale, len(self._tree_positions))
+            )
+            positions = self._tree_positions[index[0]]
+            keep = self._in_tree[positions]
+            found.append(positions[keep])
+            distances.append(distance[0][keep] * EARTH_RADIUS_KM)
+        pending = self._pending_positions()
+        found.append(pending)
+        distances.append(haversine_km(latitude, longitude, self._coordinates[pending]))
+        positions, distances = self._sorted(np.concatenate(found), np.concatenate(distances))
+        return positions[:max(k, 0)], distances[:max(k, 0)]
+
+    @staticmethod
+    def _sorted(positions: np.ndarray, distances: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Order results by distance, then position."""
+        order = np.lexsort((positions, distances))
+        return positions[order], distances[order]
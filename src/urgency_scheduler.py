@@ -0,0 +1,167 @@
+"""
+Deadline-ordered scheduling of caseload matching.
+
+Households must not stay in emergency accommodation beyond 42 days, so the
+caseload is matched closest-to-the-limit first. UrgencyScheduler holds open
+cases in a binary heap keyed by the day each household reaches the limit,
+then by priority_need, then by arrival order, and dispatches matching in
+that order with a configurable number of concurrent workers.
+
+Keys are absolute deadline days rather than days left, so the daily tick of
+length_of_placement changes no keys and costs nothing; advance() just moves
+the scheduler's clock. Re-prioritising one household (e.g. a corrected
+placement length or a new priority need) pushes a fresh entry and retires
+the old one in O(log n).
+"""
+import heapq
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from allocation import PRIORITY_WEIGHTS
+from availability_index import day_number
+from match_results import EMERGENCY_LIMIT_DAYS
+
+# Order in which priority need levels are served when deadlines tie: the
+# heaviest allocation weight first, unknown levels last
+PRIORITY_ORDER: Dict[str, int] = {
+    level: rank for rank, level in enumerate(sorted(PRIORITY_WEIGHTS, key=PRIORITY_WEIGHTS.get, reverse=True))
+}
+
+
+class UrgencyScheduler:
+    """Priority queue of households, most urgent first, feeding a matcher."""
+
+    def __init__(self, matcher, concurrency: int = 1, today=None):
+        """
+        Args:
+            matcher: AccommodationMatcher used by dispatch
+            concurrency: Households matched at the same time by dispatch
+            today: Current date (default: the system date)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.matcher = matcher
+        self.concurrency = concurrency
+        self.today = day_number(pd.Timestamp.today() if today is None else today)
+        self._heap: List[List] = []
+        self._entries: Dict[Any, List] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, household_id) -> bool:
+        return household_id in self._entries
+
+    def add(self, household: Dict):
+        """
+        Queue a household, or re-prioritise it if already queued.
+
+        The deadline is today plus the days left before the 42-day limit.
+        """
+        household_id = household.get('household_id')
+        if household_id is None:
+            raise ValueError("Scheduled households need a household_id")
+        deadline = self.today + EMERGENCY_LIMIT_DAYS - int(household.get('length_of_placement', 0))
+        priority = PRIORITY_ORDER.get(str(household.get('priority_need', '')), len(PRIORITY_ORDER))
+        self.remove(household_id)
+        entry = [deadline, priority, next(self._counter), household]
+        self._entries[household_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    update = add
+
+    def remove(self, household_id) -> Optional[Dict]:
+        """Take a household out of the queue (e.g. once placed); returns it if queued."""
+        entry = self._entries.pop(household_id, None)
+        if entry is None:
+            return None
+        household = entry[-1]
+        entry[-1] = None  # retired; skipped when it reaches the top
+        return household
+
+    def advance(self, days: int = 1):
+        """Move the clock forward; queued households' deadlines are unchanged."""
+        self.today += days
+
+    def days_left(self, household_id) -> int:
+        """Days before a queued household reaches the 42-day limit (negative once past it)."""
+        return self._entries[household_id][0] - self.today
+
+    def _top(self) -> Optional[List]:
+        """The most urgent live entry, dropping retired ones."""
+        while self._heap and self._heap[0][-1] is None:
+            heapq.heappop(self._heap)
+        return self._heap[0] if self._heap else None
+
+    def peek(self) -> Optional[Dict]:
+        """The most urgent household, without removing it."""
+        entry = self._top()
+        return None if entry is None else entry[-1]
+
+    def pop(self) -> Dict:
+        """
+        Remove and return the most urgent household.
+
+        The household is returned as a copy whose length_of_placement is
+        brought up to the scheduler's clock, so matching sees the days it
+        has actually spent in emergency accommodation.
+        """
+        entry = self._top()
+        if entry is None:
+            raise IndexError("pop from an empty UrgencyScheduler")
+        heapq.heappop(self._heap)
+        deadline, household = entry[0], entry[-1]
+        del self._entries[household['household_id']]
+        return dict(household, length_of_placement=EMERGENCY_LIMIT_DAYS - (deadline - self.today))
+
+    def dispatch(self, limit: Optional[int] = None, **match_options) -> Iterator[Tuple[Dict, Any]]:
+        """
+        Match queued households in urgency order.
+
+        Up to concurrency households are matched at once; results are
+        yielded in urgency order as (household, match_household result).
+        Households are taken off the queue as they are dispatched; if
+        iteration stops early, those whose results were not yielded are
+        queued again.
+
+        Args:
+            limit: Stop after this many households (default: drain the queue)
+            match_options: Passed to match_household (e.g. top_k, feasible_only);
+                within_deadline searches from the scheduler's date unless
+                today is given
+        """
+        if match_options.get('within_deadline'):
+            match_options.setdefault('today', pd.Timestamp(self.today, unit='D'))
+        in_flight = deque()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+                dispatched = 0
+                while len(self) and (limit is None or dispatched < limit):
+                    household = self.pop()
+                    in_flight.append((household, pool.submit(
+                        self.matcher.match_household, household, **match_options
+                    )))
+                    dispatched += 1
+                    if len(in_flight) >= self.concurrency:
+                        household, future = in_flight[0]
+                        result = future.result()
+                        in_flight.popleft()
+                        yield household, result
+                while in_flight:
+                    household, future = in_flight[0]
+                    result = future.result()
+                    in_flight.popleft()
+                    yield household, result
+        finally:
+            # Stopped early (break, close or an error): households whose
+            # results were not yielded go back on the queue, unless re-queued
+            # meanwhile
+            for household, future in in_flight:
+                future.cancel()
+                if household['household_id'] not in self:
+                    self.add(household)
@@ -0,0 +1,35 @@
+"""
+Shared fixtures: the sample property and household data.
+
+Both tables are read with the dtypes the loaders in columnar_data use, so
+text columns stay strings and "None" answers are kept.
+"""
+import pandas as pd
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from columnar_data import HOUSEHOLD_DTYPES, HOUSEHOLD_NA_OPTIONS, PROPERTY_DTYPES
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+@pytest.fixture
+def properties_df():
+    """The sample properties, one fresh DataFrame per test."""
+    return pd.read_csv(DATA_DIR / 'property_data.csv', dtype=PROPERTY_DTYPES)
+
+
+@pytest.fixture
+def households_df():
+    """The sample households, one fresh DataFrame per test."""
+    return pd.read_csv(DATA_DIR / 'household_data.csv', dtype=HOUSEHOLD_DTYPES, **HOUSEHOLD_NA_OPTIONS)
+
+
+@pytest.fixture
+def households(households_df):
+    """The sample households as records."""
+    return households_df.to_dict('records')
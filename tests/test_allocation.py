@@ -0,0 +1,47 @@
+"""
+Tests for cohort allocation of households to properties.
+Run with: python -m pytest tests/test_allocation.py
+"""
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from matching_engine import AccommodationMatcher
+from allocation import allocate, urgency_weight
+
+
+def test_urgency_weight_grows_towards_the_limit():
+    """Households nearer the 42-day limit and in higher priority need weigh more."""
+    assert urgency_weight(0, 'Low') == 1.0
+    assert urgency_weight(42, 'Low') == 2.0
+    assert urgency_weight(35, 'High') > urgency_weight(20, 'High')
+    assert urgency_weight(20, 'Critical') > urgency_weight(20, 'Medium')
+
+
+def test_allocation_gives_each_property_to_one_feasible_household(properties_df, households_df):
+    """Every placed household gets a distinct property that meets its hard constraints."""
+    matcher = AccommodationMatcher(properties_df)
+    
+    # Duplicate the caseload so households compete for the same units
+    cohort = pd.concat([households_df, households_df.assign(
+        household_id=households_df['household_id'] + '-B'
+    )], ignore_index=True)
+    allocation = allocate(matcher, cohort)
+    
+    assert len(allocation) == len(cohort)
+    placed = allocation.dropna(subset=['property_id'])
+    assert placed['property_id'].is_unique
+    
+    households = cohort.set_index('household_id').to_dict('index')
+    for row in placed.itertuples():
+        household = dict(households[row.household_id], household_id=row.household_id)
+        feasible = matcher.feasible_candidates(household)
+        assert row.property_id in set(matcher.properties['property_id'].iloc[feasible])
+    
+    # A lone household is placed in its best feasible property
+    alone = allocate(matcher, households_df.iloc[[0]])
+    best = matcher.match_household(households_df.iloc[0].to_dict(), top_k=1, feasible_only=True)
+    assert alone['property_id'].iloc[0] == best[0]['property_id']
@@ -0,0 +1,86 @@
+"""
+Tests for the amenity proximity index.
+Run with: python -m pytest tests/test_amenity_index.py
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from amenity_index import AMENITY_TYPES, AmenityIndex
+from matching_engine import AccommodationMatcher
+from property_store import PropertyStore
+from spatial_index import haversine_km
+
+
+@pytest.fixture
+def located(properties_df):
+    """Sample properties with coordinates, and a random amenity layer."""
+    rng = np.random.default_rng(3)
+    properties_df['latitude'] = rng.uniform(51.45, 51.55, len(properties_df))
+    properties_df['longitude'] = rng.uniform(-0.2, 0.0, len(properties_df))
+    amenities = pd.DataFrame({
+        'amenity_type': rng.choice(AMENITY_TYPES, 40),
+        'latitude': rng.uniform(51.45, 51.55, 40),
+        'longitude': rng.uniform(-0.2, 0.0, 40),
+    })
+    return properties_df, amenities
+
+
+def test_distances_match_brute_force(located):
+    """Precomputed and incrementally updated distances equal a full scan."""
+    properties_df, amenities = located
+    coordinates = properties_df[['latitude', 'longitude']].to_numpy()
+    index = AmenityIndex(coordinates, amenities.iloc[:30])
+    for row in amenities.iloc[30:].itertuples():
+        index.add_amenity(row.amenity_type, row.latitude, row.longitude)
+
+    for j, amenity_type in enumerate(AMENITY_TYPES):
+        points = amenities[amenities['amenity_type'] == amenity_type][['latitude', 'longitude']]
+        expected = np.array([
+            haversine_km(lat, lon, points.to_numpy()).min() if len(points) else np.inf
+            for lat, lon in coordinates
+        ])
+        assert np.allclose(index.distances[:, j], expected, rtol=1e-5)
+
+
+def test_added_amenity_matches_a_fresh_layer(located, households):
+    """add_amenity leaves the matcher ranking exactly as a layer built from scratch."""
+    properties_df, amenities = located
+    live = AccommodationMatcher(properties_df)
+    live.attach_amenities(amenities.iloc[:-1])
+    fresh = AccommodationMatcher(properties_df)
+    fresh.attach_amenities(amenities)
+
+    last = amenities.iloc[-1]
+    affected = live.add_amenity(last['amenity_type'], last['latitude'], last['longitude'])
+    j = AMENITY_TYPES.index(last['amenity_type'])
+    assert np.allclose(live.amenity_distances[affected, j], fresh.amenity_distances[affected, j])
+    assert np.array_equal(live.amenity_bits, fresh.amenity_bits)
+    for household in households:
+        assert live.match_household(household) == fresh.match_household(household)
+
+
+def test_layer_leaves_a_shared_store_untouched(located, households):
+    """A layer on one matcher neither writes the (read-only) store nor changes other matchers."""
+    properties_df, amenities = located
+    store = PropertyStore.from_dataframe(properties_df).freeze()
+    text_bits, version = store.amenity_bits.copy(), store.data_version
+    layered = AccommodationMatcher(store)
+    plain = AccommodationMatcher(store)
+    plain.match_household(households[0])
+
+    layered.attach_amenities(amenities)
+    last = amenities.iloc[-1]
+    layered.add_amenity(last['amenity_type'], last['latitude'], last['longitude'])
+
+    assert np.array_equal(store.amenity_bits, text_bits) and store.data_version == version
+    assert not np.array_equal(layered.amenity_bits, plain.amenity_bits)
+    assert layered.data_version != plain.data_version
+    reference = AccommodationMatcher(properties_df)
+    for household in households:
+        assert plain.match_household(household) == reference.match_household(household)
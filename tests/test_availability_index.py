@@ -0,0 +1,62 @@
+"""
+Tests for availability windows and the interval index.
+Run with: python -m pytest tests/test_availability_index.py
+"""
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from availability_index import OPEN_END, OPEN_START, AvailabilityIndex
+from matching_engine import AccommodationMatcher
+
+
+def test_overlap_queries_match_brute_force_through_updates():
+    """overlapping() returns exactly the windows that meet the range, after live changes."""
+    rng = np.random.default_rng(11)
+    starts = rng.integers(0, 400, 3000)
+    ends = starts + rng.integers(0, 60, 3000)
+    starts[::10] = OPEN_START
+    ends[::7] = OPEN_END
+    index = AvailabilityIndex(starts, ends)
+    live = np.ones(len(starts), dtype=bool)
+
+    for position in rng.integers(0, 3000, 400):
+        if rng.random() < 0.3:
+            index.remove(position)
+            live[position] = False
+        else:
+            starts[position] = rng.integers(0, 400)
+            ends[position] = starts[position] + rng.integers(-3, 60)
+            index.add(position, starts[position], ends[position])
+            live[position] = starts[position] <= ends[position]
+
+    for first, last in [(0, 0), (100, 142), (390, 500), (-50, -1)]:
+        expected = np.flatnonzero(live & (starts <= last) & (ends >= first))
+        assert list(index.overlapping(first, last)) == list(expected)
+
+
+def test_within_deadline_keeps_units_free_before_the_limit(properties_df, households_df):
+    """Only units available before the 42-day limit are ranked."""
+    properties_df['available_from'] = [
+        f'2025-01-{day:02d}' for day in range(1, len(properties_df) * 2, 2)
+    ]
+    properties_df['available_until'] = None
+    properties_df.loc[0, 'available_until'] = '2024-12-01'
+    matcher = AccommodationMatcher(properties_df)
+    household = dict(households_df.iloc[0], length_of_placement=30)
+
+    # 12 days left from 1 January: units from the 1st to the 13th, except
+    # the one whose window has already closed
+    results = matcher.match_household(household, within_deadline=True, today='2025-01-01')
+    expected = {pid for pid in properties_df['property_id'][1:7]}
+    assert set(results.property_ids) == expected
+    full = [r for r in matcher.match_household(household) if r['property_id'] in expected]
+    assert results == full
+
+    matcher.withdraw_property('PROP002')
+    assert 'PROP002' not in matcher.match_household(
+        household, within_deadline=True, today='2025-01-01'
+    ).property_ids
@@ -0,0 +1,72 @@
+"""
+Tests for columnar data files and the column-selecting loaders.
+Run with: python -m pytest tests/test_columnar_data.py
+"""
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import columnar_data
+from household_profile import compile_household
+from matching_engine import AccommodationMatcher
+from property_store import PropertyStore
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+def test_loader_reads_only_matcher_columns(properties_df, tmp_path):
+    """Unused CSV columns are skipped and rankings are unchanged."""
+    full = properties_df.assign(landlord_notes='unused')
+    full.to_csv(tmp_path / 'property_data.csv', index=False)
+
+    loaded = columnar_data.load_properties(tmp_path / 'property_data.csv')
+    assert 'landlord_notes' not in loaded.columns
+    households = columnar_data.load_households(DATA_DIR / 'household_data.csv')
+    for household in households.to_dict('records'):
+        assert (AccommodationMatcher(loaded).match_household(household)
+                == AccommodationMatcher(full).match_household(household))
+
+
+def test_columnar_copy_round_trips(properties_df, tmp_path):
+    """The memory-mapped copy loads to the same rankings as the CSV."""
+    pytest.importorskip('pyarrow')
+    csv_file = tmp_path / 'property_data.csv'
+    shutil.copy(DATA_DIR / 'property_data.csv', csv_file)
+    columnar_data.convert_to_columnar(
+        csv_file, columnar_data.PROPERTY_DTYPES, ['location', 'neighbour_quality', 'tenure_length']
+    )
+    csv_file.unlink()
+
+    assert columnar_data.data_available(csv_file)
+    loaded = columnar_data.load_properties(csv_file)
+    assert isinstance(loaded['location'].dtype, pd.CategoricalDtype)
+    for household in columnar_data.load_households(DATA_DIR / 'household_data.csv').to_dict('records'):
+        assert (AccommodationMatcher(loaded).match_household(household)
+                == AccommodationMatcher(properties_df).match_household(household))
+
+
+def test_typed_loader_uses_compact_dtypes(properties_df):
+    """Text is categorical, numbers downcast, features pre-encoded; the store is unchanged."""
+    loaded = columnar_data.load_properties(DATA_DIR / 'property_data.csv')
+    assert isinstance(loaded['location'].dtype, pd.CategoricalDtype)
+    assert loaded['beds'].dtype == np.int16 and loaded['affordability'].dtype == np.float32
+
+    typed, plain = PropertyStore.from_dataframe(loaded), PropertyStore.from_dataframe(properties_df)
+    assert np.array_equal(loaded['access_bits'], plain.access_bits)
+    assert typed.columns == plain.columns
+    assert typed.data_version == plain.data_version
+    assert [typed.record(i) for i in range(len(properties_df))] == properties_df.to_dict('records')
+
+
+def test_households_keep_none_answers():
+    """'None' in household text fields is an answer, not a missing value."""
+    households = columnar_data.load_households(DATA_DIR / 'household_data.csv')
+    household = households.set_index('household_id').loc['HH003']
+    assert household['access_needs'] == 'None'
+    assert compile_household(dict(household)).access_requirement == 'none'
@@ -0,0 +1,28 @@
+"""
+Tests for the live-update helpers shared by the indexes.
+Run with: python -m pytest tests/test_growable.py
+"""
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from growable import REBUILD_FLOOR, grow, needs_rebuild
+
+
+def test_grow_doubles_and_fills_new_rows():
+    """Columns that fit are returned as they are; others double and keep their rows."""
+    column = np.arange(20, dtype=np.float32).reshape(10, 2)
+    assert grow(column, 9) is column
+
+    grown = grow(column, 10, np.nan)
+    assert grown.shape == (20, 2) and grown.dtype == np.float32
+    assert np.array_equal(grown[:10], column) and np.isnan(grown[10:]).all()
+    assert len(grow(column, 57)) == 58
+    assert len(grow(np.zeros(0, dtype=bool), 0)) == 16
+
+    assert not needs_rebuild(REBUILD_FLOOR, 0)
+    assert needs_rebuild(REBUILD_FLOOR + 1, 0)
+    assert not needs_rebuild(REBUILD_FLOOR + 100, 800)
@@ -0,0 +1,64 @@
+"""
+Tests for streaming caseload ingestion.
+Run with: python -m pytest tests/test_household_stream.py
+"""
+import numpy as np
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from household_stream import iter_households, iter_profiles, stream_matches
+from matching_engine import AccommodationMatcher
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+def write_caseload(path):
+    """A caseload export mixing open, closed and ineligible cases."""
+    households = pd.read_csv(DATA_DIR / 'household_data.csv', dtype=str, keep_default_na=False)
+    caseload = pd.concat([households] * 6, ignore_index=True)
+    caseload['household_id'] = [f'HH{i:04d}' for i in range(len(caseload))]
+    caseload['case_status'] = np.where(np.arange(len(caseload)) % 3 == 0, 'Closed', 'Open')
+    caseload.loc[5, 'eligibility'] = 'Not Eligible'
+    caseload.loc[7, 'intentional_homeless'] = 'Yes'
+    caseload.to_csv(path, index=False)
+    return caseload
+
+
+def test_stream_yields_open_eligible_cases_in_fixed_chunks(tmp_path):
+    """Closed and ineligible cases are dropped; chunks are full except the last."""
+    caseload = write_caseload(tmp_path / 'caseload.csv')
+    chunks = list(iter_households(tmp_path / 'caseload.csv', chunk_size=4))
+
+    expected = [
+        hid for i, hid in enumerate(caseload['household_id']) if i % 3 and i not in (5, 7)
+    ]
+    assert [h['household_id'] for chunk in chunks for h in chunk] == expected
+    assert [len(chunk) for chunk in chunks[:-1]] == [4] * (len(chunks) - 1)
+
+
+def test_streamed_scores_match_in_memory_scoring(properties_df, tmp_path):
+    """stream_matches scores the open caseload exactly like match_many."""
+    write_caseload(tmp_path / 'caseload.csv')
+    matcher = AccommodationMatcher(properties_df)
+    cohorts = list(stream_matches(matcher, tmp_path / 'caseload.csv', chunk_size=5))
+
+    open_cases = [h for chunk in iter_households(tmp_path / 'caseload.csv') for h in chunk]
+    expected = matcher.match_many(open_cases)
+    assert [hid for c in cohorts for hid in c.household_ids] == expected.household_ids
+    assert np.array_equal(np.vstack([c.scores for c in cohorts]), expected.scores)
+
+
+def test_streamed_none_answers_mean_no_needs(tmp_path):
+    """A household answering "None" to access needs has no access requirement."""
+    caseload = write_caseload(tmp_path / 'caseload.csv')
+    profiles = {
+        p.household_id: p for chunk in iter_profiles(tmp_path / 'caseload.csv') for p in chunk
+    }
+    no_needs = caseload.loc[caseload['access_needs'] == 'None', 'household_id']
+    open_ids = [hid for hid in no_needs if hid in profiles]
+    assert open_ids
+    assert all(profiles[hid].access_requirement == 'none' for hid in open_ids)
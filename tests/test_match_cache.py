@@ -0,0 +1,63 @@
+"""
+Tests for the ranked result cache.
+Run with: python -m pytest tests/test_match_cache.py
+"""
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from matching_engine import AccommodationMatcher
+from match_cache import MatchCache
+
+
+def test_resubmitted_household_is_served_from_cache(properties_df, households):
+    """Equivalent forms hit the cache, including across rebuilt matchers."""
+    cache = MatchCache(maxsize=8)
+    household = households[0]
+
+    first = cache.match(AccommodationMatcher(properties_df), household)
+    # Same needs, different ID and spacing, against a freshly built matcher
+    resubmitted = dict(household, household_id='other',
+                       area_restrictions=f"  {household['area_restrictions'].upper()} ")
+    second = cache.match(AccommodationMatcher(properties_df), resubmitted)
+
+    assert [r['property_id'] for r in second] == [r['property_id'] for r in first]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+
+def test_property_changes_invalidate_cache(properties_df, households):
+    """A changed property gives the data a new version and fresh results."""
+    matcher = AccommodationMatcher(properties_df)
+    cache = MatchCache(maxsize=8)
+    household = households[0]
+
+    before = cache.match(matcher, household, top_k=1)
+    matcher.withdraw_property(before[0]['property_id'])
+    after = cache.match(matcher, household, top_k=1)
+
+    assert after[0]['property_id'] != before[0]['property_id']
+    assert cache.stats().invalidations == 1
+    assert cache.stats().hits == 0
+
+
+def test_entries_expire_and_evict(properties_df, households):
+    """Entries older than the TTL are recomputed and the LRU size is bounded."""
+    matcher = AccommodationMatcher(properties_df)
+    now = [0.0]
+    cache = MatchCache(maxsize=2, ttl=10, clock=lambda: now[0])
+
+    cache.match(matcher, households[0])
+    now[0] = 11.0
+    cache.match(matcher, households[0])
+    assert cache.stats().expirations == 1
+
+    distinct = {}
+    for h in households:
+        distinct.setdefault((h['household_composition'], h['area_restrictions'], h['affordability']), h)
+    for h in distinct.values():
+        cache.match(matcher, h)
+    assert len(cache) == 2
+    assert cache.stats().evictions >= 1
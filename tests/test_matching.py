@@ -2,14 +2,18 @@
 Test script to verify the matching engine works correctly.
 Run with: python test_matching.py
 """
+import numpy as np
 import pandas as pd
+import pytest
 from pathlib import Path
 import sys
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from matching_engine import AccommodationMatcher
+from matching_engine import AccommodationMatcher, rank_scores
+from household_profile import HouseholdProfile
+from match_results import RankedMatches
 
 def test_matching():
     """Test the matching engine with sample household."""
@@ -103,5 +107,256 @@ def test_matching():
     print(f"\nTotal properties evaluated: {len(results)}")
     print(f"Suitable properties (score > 0.5): {sum(1 for r in results if r['overall_score'] > 0.5)}")
 
+
+def reference_scores(matcher, household):
+    """Score every property with the scalar score_* methods (reference implementation)."""
+    required_beds = matcher.calculate_bedroom_requirement(household['household_composition'])
+    rows = []
+    for _, prop in matcher.properties.iterrows():
+        rows.append([
+            matcher.score_location(household['area_restrictions'], prop['location']),
+            matcher.score_bedroom_suitability(required_beds, int(prop['beds'])),
+            matcher.score_affordability(float(household['affordability']), float(prop['affordability'])),
+            matcher.score_access_needs(household['access_needs'], prop['access_features']),
+            matcher.score_amenities(household, prop['nearby_amenities'])
+        ])
+    return rows
+
+
+def test_vectorized_scores_match_scalar_reference(properties_df, households):
+    """The vectorized scorer must reproduce the scalar score_* methods exactly."""
+    matcher = AccommodationMatcher(properties_df)
+    
+    for household in households:
+        results = matcher.match_household(household)
+        expected = reference_scores(matcher, household)
+        weights = [matcher.WEIGHTS[c] for c in matcher.COMPONENTS]
+        
+        assert len(results) == len(expected)
+        by_id = {r['property_id']: r for r in results}
+        for prop_id, components in zip(matcher.properties['property_id'], expected):
+            result = by_id[prop_id]
+            assert list(result['component_scores'].values()) == components
+            overall = sum(score * weight for score, weight in zip(components, weights))
+            assert abs(result['overall_score'] - overall) < 1e-12
+        
+        scores = [r['overall_score'] for r in results]
+        assert scores == sorted(scores, reverse=True)
+
+
+def test_match_many_agrees_with_match_household(properties_df, households_df):
+    """Cohort scoring returns the same scores as matching each household alone."""
+    matcher = AccommodationMatcher(properties_df)
+    
+    cohort = matcher.match_many(households_df)
+    chunked = matcher.match_many(households_df, chunk_size=3)
+    
+    assert cohort.scores.shape == (len(households_df), len(matcher.properties))
+    assert np.array_equal(cohort.scores, chunked.scores)
+    assert set(cohort.components) == set(matcher.COMPONENTS)
+    
+    for i, household in enumerate(households_df.to_dict('records')):
+        row = cohort.row(household['household_id'])
+        for result in matcher.match_household(household):
+            column = cohort.property_ids.index(result['property_id'])
+            assert abs(row[column] - result['overall_score']) < 1e-12
+            assert cohort.components['location'][i, column] == result['component_scores']['location']
+
+
+def test_match_many_numbers_unidentified_households_across_chunks(properties_df, households_df):
+    """Households without an ID get their caseload row number; generators are accepted."""
+    matcher = AccommodationMatcher(properties_df)
+    households = households_df.drop(columns='household_id')
+    
+    chunked = matcher.match_many(households, chunk_size=3)
+    assert chunked.household_ids == list(range(len(households)))
+    
+    streamed = matcher.match_many(h for h in households.to_dict('records'))
+    assert streamed.household_ids == chunked.household_ids
+    assert np.array_equal(streamed.scores, chunked.scores)
+
+
+def test_top_k_matches_head_of_full_ranking(properties_df, households):
+    """top_k returns exactly the first k entries of the full ranking, ties included."""
+    matcher = AccommodationMatcher(properties_df)
+    for household in households:
+        full = matcher.match_household(household)
+        for k in (0, 1, 3, len(full), len(full) + 5):
+            assert matcher.match_household(household, top_k=k) == full[:k]
+    
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 5, size=200).astype(float)
+    for k in (1, 7, 50, 199):
+        assert list(rank_scores(scores, k)) == list(np.argsort(-scores, kind='stable')[:k])
+
+
+def test_feasible_only_drops_exactly_the_hopeless_pairs(properties_df, households):
+    """feasible_only keeps the full ranking minus zero bed, budget or access scores."""
+    matcher = AccommodationMatcher(properties_df)
+    hard = ('bedrooms', 'affordability', 'access')
+    for household in households:
+        expected = [
+            r for r in matcher.match_household(household)
+            if all(r['component_scores'][c] > 0 for c in hard)
+        ]
+        assert matcher.match_household(household, feasible_only=True) == expected
+        
+        in_area = matcher.properties.iloc[matcher.feasible_candidates(household, same_area=True)]
+        assert (in_area['location'] == household['area_restrictions']).all()
+
+
+def test_household_profile_is_accepted_directly(properties_df, households):
+    """A compiled HouseholdProfile scores exactly like the household dict."""
+    matcher = AccommodationMatcher(properties_df)
+    for household in households:
+        profile = HouseholdProfile.from_household(household)
+        assert profile.required_beds == matcher.calculate_bedroom_requirement(
+            household['household_composition']
+        )
+        assert matcher.match_household(profile) == matcher.match_household(household)
+
+
+def test_explanations_render_lazily(properties_df, households):
+    """Flags and explanations are built on first access and match the reason code."""
+    matcher = AccommodationMatcher(properties_df)
+    household = households[1]
+    result = matcher.match_household(household, top_k=1)[0]
+    
+    assert 'match_explanation' in result
+    assert 'match_explanation' not in result._values
+    assert matcher.explain(result) == result['match_explanation']
+    assert result['match_explanation'].startswith('✓ Location matches preferred area')
+    assert len(result['suitability_flags']) == bin(result.reason_code).count('1')
+    assert '🚨 URGENT - 42-day emergency limit reached/exceeded' in result['suitability_flags']
+
+
+def test_live_property_changes_match_a_rebuilt_matcher(properties_df, households):
+    """add/update/withdraw on a live matcher rank exactly like a fresh matcher."""
+    matcher = AccommodationMatcher(properties_df)
+    
+    new_unit = dict(properties_df.iloc[0], property_id='PROP016', affordability=780)
+    matcher.add_property(new_unit)
+    matcher.update_property('PROP006', {'affordability': 900, 'beds': 3})
+    matcher.withdraw_property('PROP001')
+    
+    expected_df = pd.concat([properties_df, pd.DataFrame([new_unit])], ignore_index=True)
+    expected_df.loc[expected_df['property_id'] == 'PROP006', ['affordability', 'beds']] = [900, 3]
+    expected_df = expected_df[expected_df['property_id'] != 'PROP001']
+    rebuilt = AccommodationMatcher(expected_df)
+    
+    assert len(matcher.properties) == len(expected_df)
+    for household in households:
+        for options in ({}, {'feasible_only': True}, {'top_k': 3}):
+            live = matcher.match_household(household, **options)
+            fresh = rebuilt.match_household(household, **options)
+            assert [(r['property_id'], r['overall_score']) for r in live] == \
+                [(r['property_id'], r['overall_score']) for r in fresh]
+
+
+def test_ranked_matches_read_like_result_dicts(properties_df, households):
+    """RankedMatches slices, exports and indexes consistently with its rows."""
+    matcher = AccommodationMatcher(properties_df)
+    household = households[0]
+    matches = matcher.match_household(household)
+    
+    top = matches[:3]
+    assert isinstance(top, RankedMatches)
+    assert list(top) == [matches[0], matches[1], matches[2]]
+    assert matches[-1] == matches[len(matches) - 1]
+    assert top.property_ids == [r['property_id'] for r in top]
+    
+    records = top.to_records()
+    assert records[0]['match_explanation'] == matches[0]['match_explanation']
+    assert records[0]['component_scores'] == matches[0]['component_scores']
+    
+    frame = matches.to_dataframe()
+    assert list(frame['property_id']) == matches.property_ids
+    assert np.allclose(frame['overall_score'], [r['overall_score'] for r in matches])
+    assert list(frame['bedrooms_score']) == [r['component_scores']['bedrooms'] for r in matches]
+    assert [len(r['suitability_flags']) for r in matches] == \
+        [bin(code).count('1') for code in frame['reason_code']]
+
+
+def test_held_ranking_ignores_later_property_changes(properties_df, households):
+    """Updating or withdrawing a ranked property leaves the ranking as it was made."""
+    matcher = AccommodationMatcher(properties_df)
+    matches = matcher.match_household(households[0])
+    top = matches[:3]
+    before, frame = matches.to_records(), matches.to_dataframe()
+    
+    property_id = top[0]['property_id']
+    matcher.update_property(property_id, {'affordability': 99999})
+    matcher.withdraw_property(property_id)
+    
+    assert matches.to_records() == before
+    assert top.to_records() == before[:3]
+    pd.testing.assert_frame_equal(matches.to_dataframe(), frame)
+    assert '£99999' not in top[0]['match_explanation']
+    assert property_id not in matcher.match_household(households[0]).property_ids
+
+
+def test_iter_matches_streams_the_full_ranking(properties_df, households):
+    """Batches from iter_matches concatenate to match_household's ranking."""
+    matcher = AccommodationMatcher(properties_df)
+    for household in households:
+        for options in ({}, {'feasible_only': True}):
+            expected = matcher.match_household(household, **options)
+            for batch_size in (1, 4, 100):
+                batches = list(matcher.iter_matches(household, batch_size=batch_size, **options))
+                assert all(len(batch) <= batch_size for batch in batches)
+                assert [r for batch in batches for r in batch] == list(expected)
+
+
+def test_reweighting_reuses_component_scores(properties_df, households):
+    """Per-call and per-matcher weights re-rank cached components without rescoring."""
+    weights = {'location': 0.25, 'bedroom_suitability': 0.3, 'affordability': 0.25,
+               'access_needs': 0.15, 'amenities': 0.05}
+    matcher = AccommodationMatcher(properties_df)
+    reweighted_matcher = AccommodationMatcher(properties_df, weights=weights)
+    
+    matcher.match_household(households[0])
+    scored = []
+    matcher.score_components = lambda *args: scored.append(args)
+    per_call = matcher.match_household(households[0], weights=weights)
+    assert scored == []
+    assert per_call == reweighted_matcher.match_household(households[0])
+    
+    cohort = matcher.match_many(households[:3])
+    assert np.allclose(matcher.reweight(cohort, weights).scores,
+                       reweighted_matcher.match_many(households[:3]).scores)
+    
+    with pytest.raises(ValueError):
+        matcher.set_weights(dict(weights, location=0.5))
+    with pytest.raises(ValueError):
+        matcher.match_household(households[0], weights={'location': 1.0})
+
+
+def test_pruned_top_k_equals_exhaustive_ranking(properties_df, households):
+    """Bounded top-k search returns exactly the head of the exhaustive ranking."""
+    stock = pd.concat([properties_df] * 20, ignore_index=True)
+    stock['property_id'] = [f'P{i:04d}' for i in range(len(stock))]
+    stock['beds'] = np.arange(len(stock)) % 5 + 1
+    
+    for household in households:
+        for options in ({}, {'feasible_only': True}):
+            exhaustive = AccommodationMatcher(stock).match_household(household, **options)
+            for k in (1, 5, 40):
+                pruned = AccommodationMatcher(stock).match_household(household, top_k=k, **options)
+                assert pruned == exhaustive[:k]
+    
+    # An in-area top-1 query scores only part of the stock
+    matcher = AccommodationMatcher(stock)
+    scored = []
+    score_components = matcher.score_components
+    
+    def counting_score_components(profile, positions):
+        scored.extend(positions)
+        return score_components(profile, positions)
+    
+    matcher.score_components = counting_score_components
+    top = matcher.match_household(households[0], top_k=1)
+    assert top == AccommodationMatcher(stock).match_household(households[0])[:1]
+    assert 0 < len(scored) < len(stock)
+
 if __name__ == '__main__':
     test_matching()
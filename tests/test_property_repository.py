@@ -0,0 +1,43 @@
+"""
+Tests for the SQLite property repository.
+Run with: python -m pytest tests/test_property_repository.py
+"""
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from matching_engine import AccommodationMatcher
+from property_repository import PropertyRepository
+
+
+def test_pushed_down_candidates_equal_feasible_ranking(properties_df, households, tmp_path):
+    """SQL candidates rank exactly like feasible_only on the full stock."""
+    matcher = AccommodationMatcher(properties_df)
+    with PropertyRepository.from_dataframe(properties_df, tmp_path / 'properties.db') as repository:
+        for household in households:
+            for same_area in (False, True):
+                expected = matcher.feasible_candidates(household, same_area=same_area)
+                fetched = repository.candidates(household, same_area=same_area)
+                assert list(fetched['property_id']) == list(matcher.store.property_ids[expected])
+
+            local = AccommodationMatcher.from_repository(repository, household)
+            assert local.match_household(household) == matcher.match_household(household, feasible_only=True)
+
+
+def test_repository_updates_persist(properties_df, tmp_path):
+    """Added and removed properties are reflected after reopening the file."""
+    path = tmp_path / 'properties.db'
+    with PropertyRepository.from_dataframe(properties_df, path) as repository:
+        new = dict(properties_df.iloc[0], property_id='PROP999', access_features='Ground floor')
+        repository.add_property(new)
+        repository.remove_property('PROP001')
+
+    with PropertyRepository(path) as repository:
+        assert len(repository) == len(properties_df)
+        ids = list(repository.query(access_requirement='ground floor')['property_id'])
+        assert 'PROP999' in ids and 'PROP001' not in ids
+        assert list(repository.all_properties().columns) == list(
+            c for c in properties_df.columns if c in repository.columns
+        )
@@ -0,0 +1,57 @@
+"""
+Tests for the columnar property store.
+Run with: python -m pytest tests/test_property_store.py
+"""
+import numpy as np
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from matching_engine import AccommodationMatcher
+from property_store import PropertyStore
+
+
+def test_store_uses_compact_typed_columns(properties_df):
+    """Numbers are downcast and repeated text is stored as category codes."""
+    store = PropertyStore.from_dataframe(properties_df)
+    
+    assert store.beds.dtype == np.int16
+    assert store.rents.dtype == np.float32
+    assert store.location_codes.dtype == np.int32
+    assert len(store.categories['location']) == properties_df['location'].nunique()
+    assert store.record(0) == properties_df.iloc[0].to_dict()
+    
+    roundtrip = store.to_dataframe()
+    assert list(roundtrip.columns) == list(properties_df.columns)
+    assert roundtrip['property_id'].tolist() == properties_df['property_id'].tolist()
+
+
+def test_frozen_store_is_shared_between_matchers(properties_df, households):
+    """Matchers built on one store read it without copying and cannot modify it."""
+    store = PropertyStore.from_dataframe(properties_df).freeze()
+    first, second = AccommodationMatcher(store), AccommodationMatcher(store)
+    
+    assert first.store is second.store
+    household = households[0]
+    assert first.match_household(household) == AccommodationMatcher(properties_df).match_household(household)
+    with pytest.raises(ValueError):
+        first.add_property(dict(properties_df.iloc[0], property_id='PROP099'))
+
+
+def test_rent_equal_to_budget_is_affordable(properties_df, households):
+    """Single-precision rents compare with budgets in the same precision."""
+    properties_df['affordability'] = properties_df['affordability'].astype(float)
+    properties_df.loc[0, 'affordability'] = 812.7
+    matcher = AccommodationMatcher(properties_df)
+    household = dict(households[0], affordability='812.7')
+
+    assert matcher.score_affordability(812.7, 812.7) == 1.0
+    assert 0 in matcher.feasible_candidates(household)
+    [result] = [r for r in matcher.match_household(household) if r['property_id'] == 'PROP001']
+    assert result['component_scores']['affordability'] == 1.0
+    assert result['affordability'] == 812.7
+    assert '£812.7/month' in result['match_explanation']
+    assert 'PROP001' in matcher.match_household(household, feasible_only=True).property_ids
@@ -0,0 +1,95 @@
+"""
+Tests for distance-based location scoring and the spatial index.
+Run with: python -m pytest tests/test_spatial_index.py
+"""
+import numpy as np
+import pytest
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from matching_engine import AccommodationMatcher
+from spatial_index import SpatialIndex, haversine_km
+
+
+@pytest.fixture
+def located_df(properties_df):
+    """Sample properties given coordinates around central London."""
+    offsets = np.arange(len(properties_df))
+    properties_df['latitude'] = 51.50 + 0.01 * offsets
+    properties_df['longitude'] = -0.12 + 0.005 * (offsets % 4)
+    return properties_df
+
+
+def test_queries_match_brute_force_through_live_updates():
+    """Radius and nearest queries agree with a full scan, before and after updates."""
+    rng = np.random.default_rng(7)
+    coordinates = np.column_stack([rng.uniform(51.3, 51.7, 2000), rng.uniform(-0.5, 0.3, 2000)])
+    coordinates[::50] = np.nan
+    index = SpatialIndex(coordinates)
+
+    for position in range(0, 300, 3):
+        coordinates[position] = (rng.uniform(51.3, 51.7), rng.uniform(-0.5, 0.3))
+        index.add(position, *coordinates[position])
+    for position in range(1, 300, 7):
+        coordinates[position] = np.nan
+        index.remove(position)
+
+    for latitude, longitude in [(51.5, -0.1), (51.35, 0.25), (51.69, -0.45)]:
+        distances = haversine_km(latitude, longitude, coordinates)
+        known = np.flatnonzero(~np.isnan(distances))
+
+        positions, found = index.within(latitude, longitude, 3.0)
+        expected = known[distances[known] <= 3.0]
+        assert set(positions) == set(expected)
+        assert np.allclose(found, distances[positions])
+
+        positions, found = index.nearest(latitude, longitude, 25)
+        assert list(positions) == list(known[np.lexsort((known, distances[known]))][:25])
+
+
+def test_distance_mode_scores_by_anchor_distance(located_df, households):
+    """Nearer properties score higher; area mode and anchor-less households are unchanged."""
+    properties_df = located_df
+    area = AccommodationMatcher(properties_df)
+    distance = AccommodationMatcher(properties_df, location_mode='distance')
+
+    for household in households:
+        assert distance.match_household(household) == area.match_household(household)
+
+    household = dict(households[0], school_location='51.50, -0.12')
+    scores = distance.score_components(household)[:, 0]
+    anchor_distances = haversine_km(51.50, -0.12, distance.store.coordinates)
+    assert np.allclose(scores, [distance.score_distance(d) for d in anchor_distances])
+    assert scores[0] == 1.0 and np.all(np.diff(scores) <= 0)
+
+    positions, _ = distance.nearby_properties(51.50, -0.12, k=3)
+    assert list(positions) == [0, 1, 2]
+
+    exhaustive = distance.match_household(household)
+    assert AccommodationMatcher(properties_df, location_mode='distance').match_household(
+        household, top_k=5
+    ) == exhaustive[:5]
+
+
+def test_distance_mode_flags_units_out_of_reach(located_df, households):
+    """A zero distance score is flagged as out of reach, not as the wrong area."""
+    located_df.loc[1, ['latitude', 'longitude']] = np.nan
+    matcher = AccommodationMatcher(located_df, location_mode='distance', distance_radius_km=3.0)
+    household = dict(households[0], school_location='51.50, -0.12')
+    results = {r['property_id']: r for r in matcher.match_household(household)}
+
+    # PROP010 is in the household's own area but 10 km from its anchor
+    far = results['PROP010']
+    assert far['location'] == household['area_restrictions']
+    assert far['component_scores']['location'] == 0.0
+    assert "⚠️ OUT OF REACH - Too far from household's anchor points" in far['suitability_flags']
+    assert not any('WRONG LOCATION' in flag for flag in far['suitability_flags'])
+    assert far['match_explanation'].startswith("✗ Too far from household's anchor points")
+
+    # Without coordinates the area decides, and a mismatch is still the wrong area
+    unlocated = results['PROP002']
+    assert unlocated['component_scores']['location'] == 0.0
+    assert '⚠️ WRONG LOCATION - Area restriction not met' in unlocated['suitability_flags']
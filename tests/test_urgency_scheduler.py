@@ -0,0 +1,78 @@
+"""
+Tests for the deadline-ordered urgency scheduler.
+Run with: python -m pytest tests/test_urgency_scheduler.py
+"""
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from matching_engine import AccommodationMatcher
+from urgency_scheduler import UrgencyScheduler
+
+
+def test_queue_orders_by_days_left_then_priority():
+    """Closest to the 42-day limit first, ties broken by priority need; updates re-key."""
+    scheduler = UrgencyScheduler(matcher=None, today='2025-03-01')
+    scheduler.add({'household_id': 'A', 'length_of_placement': 10, 'priority_need': 'Critical'})
+    scheduler.add({'household_id': 'B', 'length_of_placement': 30, 'priority_need': 'Low'})
+    scheduler.add({'household_id': 'C', 'length_of_placement': 30, 'priority_need': 'High'})
+    scheduler.add({'household_id': 'D', 'length_of_placement': 50, 'priority_need': 'Medium'})
+
+    # Days pass without any re-keying; days left fall for everyone
+    scheduler.advance(5)
+    assert scheduler.days_left('D') == -13
+    assert scheduler.days_left('A') == 27
+
+    # A corrected placement length moves A to the front of its new deadline
+    scheduler.update({'household_id': 'A', 'length_of_placement': 35, 'priority_need': 'Critical'})
+    scheduler.remove('D')
+    assert [scheduler.pop()['household_id'] for _ in range(len(scheduler))] == ['A', 'C', 'B']
+
+
+def test_dispatch_matches_in_urgency_order(properties_df, households):
+    """dispatch yields the same results as match_household, most urgent first."""
+    matcher = AccommodationMatcher(properties_df)
+    scheduler = UrgencyScheduler(matcher, concurrency=3, today='2025-03-01')
+    for household in households:
+        scheduler.add(household)
+
+    dispatched = list(scheduler.dispatch(top_k=5))
+    days = [42 - h['length_of_placement'] for h, _ in dispatched]
+    assert days == sorted(days)
+    assert len(dispatched) == len(households) and len(scheduler) == 0
+    for household, results in dispatched:
+        assert results == matcher.match_household(household, top_k=5)
+
+
+def test_dispatch_after_advance_uses_current_placement_length(properties_df, households):
+    """Days that pass while queued count towards the 42-day limit when matching."""
+    matcher = AccommodationMatcher(properties_df)
+    scheduler = UrgencyScheduler(matcher, today='2025-03-01')
+    scheduler.add(dict(households[0], length_of_placement=40))
+    scheduler.advance(5)
+
+    [(household, results)] = list(scheduler.dispatch(top_k=3))
+    assert household['length_of_placement'] == 45
+    assert all(
+        '🚨 URGENT - 42-day emergency limit reached/exceeded' in r['suitability_flags'] for r in results
+    )
+
+
+def test_dispatch_stopped_early_requeues_unreturned_households(properties_df, households):
+    """Households in flight when iteration stops go back on the queue."""
+    matcher = AccommodationMatcher(properties_df)
+    scheduler = UrgencyScheduler(matcher, concurrency=3, today='2025-03-01')
+    for household in households:
+        scheduler.add(household)
+    deadlines = {h['household_id']: scheduler.days_left(h['household_id']) for h in households}
+
+    for household, _ in scheduler.dispatch(top_k=1):
+        break
+    assert len(scheduler) == len(households) - 1
+    assert household['household_id'] not in scheduler
+    assert all(scheduler.days_left(hid) == days for hid, days in deadlines.items() if hid in scheduler)
+
+    remaining = [h['household_id'] for h, _ in scheduler.dispatch(top_k=1)]
+    assert sorted(remaining + [household['household_id']]) == sorted(deadlines)